@@ -4,5 +4,7 @@ set -o errexit
 
 pip install -r requirements.txt
 
+# Compile the Tailwind stylesheet first, so collectstatic hashes and compresses it.
+python manage.py build_css
 python manage.py collectstatic --no-input
 python manage.py migrate
\ No newline at end of file
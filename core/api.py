@@ -0,0 +1,93 @@
+# imad/core/api.py
+
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .payload import aget_payload
+from .storage import content_storage
+
+
+# ==============================================================================
+#  READ-ONLY JSON API (v1)
+# ==============================================================================
+
+# Every resource is cut from the portfolio payload (core/payload.py), so a
+# response costs at most one primary-key lookup, and the serialised body is
+# cached under the portfolio version like the homepage.
+API_VERSION = 'v1'
+API_CACHE_TIMEOUT = 60 * 60
+
+# Browsers revalidate after a minute; shared caches (a CDN) keep a response
+# for five and may serve it stale for another ten while they revalidate.
+API_MAX_AGE = 60
+API_SHARED_MAX_AGE = 60 * 5
+API_STALE_WHILE_REVALIDATE = 60 * 10
+
+FILE_FIELDS = {'profile_image', 'cv', 'image'}
+
+# resource -> (payload key, fields in output order); single resources hold
+# one object (or null), the others a list.
+RESOURCES = {
+    'personal-info': ('info', ['id', 'name', 'title', 'bio', 'email', 'github_url', 'linkedin_url',
+                               'profile_image', 'cv', 'updated_at']),
+    'skills': ('skills', ['id', 'name', 'updated_at']),
+    'projects': ('projects', ['id', 'title', 'description', 'technologies', 'image', 'github_link',
+                              'live_link', 'display_order', 'updated_at']),
+    'experiences': ('experiences', ['id', 'category', 'title', 'company', 'start_date', 'end_date',
+                                    'description', 'updated_at']),
+}
+
+
+def parse_fields(resource, value):
+    """
+    Returns the fields of `resource` selected by a `?fields=a,b` value (all of
+    them if it is empty), in the resource's own order. Raises ValueError for
+    an unknown field.
+    """
+    fields = RESOURCES[resource][1]
+    if not value:
+        return fields
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    if unknown := requested.difference(fields):
+        raise ValueError(f"Unknown field(s) for {resource}: {', '.join(sorted(unknown))}.")
+    return [name for name in fields if name in requested]
+
+
+def _file_url(name):
+    return content_storage.url(name) if name else None
+
+
+def _serialise_row(row, fields, skill_names):
+    item = {}
+    for name in fields:
+        if name == 'technologies':
+            item[name] = [skill_names[pk] for pk in row['technologies'] if pk in skill_names]
+        elif name in FILE_FIELDS:
+            item[name] = _file_url(row[name])
+        else:
+            item[name] = row[name]
+    return item
+
+
+def render_resource(payload, resource, fields):
+    """The compact JSON body of `resource` with only `fields`, as bytes."""
+    key, _ = RESOURCES[resource]
+    skill_names = {skill['id']: skill['name'] for skill in payload['skills']}
+    rows = payload[key]
+    if isinstance(rows, list):
+        data = [_serialise_row(row, fields, skill_names) for row in rows]
+    else:
+        data = _serialise_row(rows, fields, skill_names) if rows else None
+    return json.dumps({'data': data}, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+async def aget_resource(resource, fields, version):
+    """render_resource() for the current payload, cached under the portfolio `version`."""
+    key = f"api:{API_VERSION}:{resource}:{','.join(fields)}:{version}"
+    body = await cache.aget(key)
+    if body is None:
+        body = render_resource(await aget_payload(), resource, fields)
+        await cache.aset(key, body, API_CACHE_TIMEOUT)
+    return body
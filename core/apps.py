@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Register the model signal receivers (cache invalidation etc.)
+        from . import signals  # noqa: F401
+        from . import checks  # noqa: F401
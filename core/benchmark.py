@@ -0,0 +1,634 @@
+# imad/core/benchmark.py
+
+import asyncio
+import importlib.util
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import close_old_connections, connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver, reverse
+
+from .models import PersonalInfo, Skill, Project, Experience, ContactMessage
+from .payload import rebuild_payload
+from .search import rebuild_index
+from .spam import bucket_key, make_form_token
+from .throttle import claim_login_attempt, record_login_failure
+
+
+# ==============================================================================
+#  SYNTHETIC DATASET
+# ==============================================================================
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+def seed_dataset(projects=100, skills=100, experiences=100, messages=1000, staff=10, technologies_per_project=5):
+    """
+    Fills an (empty, throwaway) database with synthetic portfolio content using
+    bulk inserts, and returns the superuser the dashboard routes log in as.
+    """
+    PersonalInfo.objects.create(name='Benchmark User', title='Developer', bio='Lorem ipsum ' * 40,
+                                email='bench@example.com', github_url='https://github.com/bench')
+    skill_rows = Skill.objects.bulk_create(Skill(name=f'Skill {i}') for i in range(skills))
+    project_rows = Project.objects.bulk_create(
+        Project(title=f'Project {i}', description='Lorem ipsum dolor sit amet. ' * 10,
+                image=f'project_images/project-{i}.png', display_order=i,
+                github_link='https://github.com/bench/project', live_link='https://example.com')
+        for i in range(projects)
+    )
+    Project.technologies.through.objects.bulk_create(
+        Project.technologies.through(project_id=project.pk, skill_id=skill_rows[(i + j) % len(skill_rows)].pk)
+        for i, project in enumerate(project_rows)
+        for j in range(min(technologies_per_project, len(skill_rows)))
+    )
+    Experience.objects.bulk_create(
+        Experience(category=('work', 'education')[i % 2], title=f'Role {i}', company=f'Company {i % 20}',
+                   start_date=date(2000, 1, 1) + timedelta(days=30 * i), description='Lorem ipsum. ' * 20)
+        for i in range(experiences)
+    )
+    ContactMessage.objects.bulk_create(
+        (ContactMessage(name=f'Sender {i}', email=f'sender{i}@example.com', message='Hello there! ' * 15)
+         for i in range(messages)),
+        batch_size=1000,
+    )
+    User.objects.bulk_create(
+        User(username=f'staff{i}', email=f'staff{i}@example.com', is_staff=True) for i in range(staff)
+    )
+    # bulk_create skips the signals that maintain the search index and payload.
+    rebuild_index()
+    rebuild_payload()
+    return User.objects.create_superuser('benchmark', 'benchmark@example.com', BENCHMARK_PASSWORD)
+
+
+# ==============================================================================
+#  ROUTES UNDER TEST
+# ==============================================================================
+
+class Route:
+    """
+    One benchmarked request. `args` and `data` are called before every
+    iteration (outside the timed section), so routes that consume rows, like
+    deletes, get a fresh row each time. `setup` may prepare the client and
+    `headers` are sent with every request.
+    """
+
+    def __init__(self, label, url_name, method='get', login=True, args=None, data=None, setup=None, headers=None):
+        self.label = label
+        self.url_name = url_name
+        self.method = method
+        self.login = login
+        self.args = args or (lambda: ())
+        self.data = data or (lambda: None)
+        self.setup = setup or (lambda client: None)
+        self.headers = headers or {}
+
+
+def _new_project():
+    return (Project.objects.create(title='Bench project', description='...', image='project_images/bench.png').pk,)
+
+def _new_skill():
+    return (Skill.objects.create(name=f'Bench skill {time.perf_counter_ns()}').pk,)
+
+def _new_experience():
+    return (Experience.objects.create(title='Bench role', company='Bench', start_date=date(2020, 1, 1),
+                                      description='...').pk,)
+
+def _new_message():
+    return (ContactMessage.objects.create(name='Bench', email='bench@example.com', message='...').pk,)
+
+def _new_staff():
+    return (User.objects.create(username=f'bench-{time.perf_counter_ns()}', is_staff=True).pk,)
+
+def _first(model):
+    return lambda: (model.objects.values_list('pk', flat=True).first(),)
+
+def _project_data():
+    return {'title': 'Bench project', 'description': '...', 'display_order': 1,
+            'technologies': list(Skill.objects.values_list('pk', flat=True)[:3])}
+
+def _experience_data():
+    return {'category': 'work', 'title': 'Bench role', 'company': 'Bench', 'start_date': '2020-01-01',
+            'description': '...'}
+
+def _unique_name():
+    return {'name': f'Bench skill {time.perf_counter_ns()}'}
+
+def _admin_data():
+    return {'username': f'bench-{time.perf_counter_ns()}', 'email': 'bench@example.com', 'is_staff': 'on',
+            'password1': 'Bench-pass-123!', 'password2': 'Bench-pass-123!'}
+
+def _message_ids():
+    ContactMessage.objects.bulk_create(
+        ContactMessage(name='Spam', email='spam@example.com', message='...') for _ in range(100)
+    )
+    return {'ids': list(ContactMessage.objects.filter(name='Spam').values_list('pk', flat=True))}
+
+def _skill_ids():
+    names = [f'Bench skill {time.perf_counter_ns()}-{i}' for i in range(20)]
+    return {'ids': [skill.pk for skill in Skill.objects.bulk_create(Skill(name=name) for name in names)]}
+
+def _reversed_project_order():
+    return {'order': list(Project.objects.order_by('-display_order').values_list('pk', flat=True))}
+
+def _import_file(name, content):
+    return lambda: {'file': SimpleUploadedFile(name, content.encode())}
+
+SKILLS_CSV = 'name\n' + ''.join(f'Imported skill {i}\n' for i in range(100))
+EXPERIENCES_JSON = json.dumps([
+    {'category': 'work', 'title': f'Imported role {i}', 'company': 'Bench', 'start_date': '2020-01-01',
+     'description': '...'}
+    for i in range(100)
+])
+
+def _media_file():
+    """A 2 MB stand-in for a CV PDF under MEDIA_ROOT."""
+    name = 'benchmark/cv.pdf'
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(b'%PDF-1.4\n' + b'0' * (2 * 1024 * 1024)))
+    return (name,)
+
+def _contact_data():
+    """A distinct message (so it isn't a duplicate) on a form shown a minute ago."""
+    return {'name': 'Bench', 'email': f'bench-{time.perf_counter_ns()}@example.com',
+            'message': f'Hello! {time.perf_counter_ns()}', 'form_token': make_form_token(time.time() - 60)}
+
+def _new_client_ip(client):
+    n = time.perf_counter_ns()
+    client.defaults['REMOTE_ADDR'] = f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'
+
+def _exhaust_ip_bucket(client):
+    client.defaults['REMOTE_ADDR'] = '192.0.2.1'
+    cache.set(bucket_key('ip', '192.0.2.1'), (0, time.time()), None)
+
+def _wrong_password():
+    return {'username': f'bench-{time.perf_counter_ns()}', 'password': 'wrong-password'}
+
+def _lock_out_ip(client):
+    client.defaults['REMOTE_ADDR'] = '192.0.2.2'
+    request = RequestFactory().post('/', REMOTE_ADDR='192.0.2.2')
+    while not claim_login_attempt(request, f'bench-{time.perf_counter_ns()}'):
+        record_login_failure(request, f'bench-{time.perf_counter_ns()}')
+
+def _clear_cache(client):
+    cache.clear()
+
+def _api_etag(client):
+    response = client.get(reverse('core:api', args=('projects',)))
+    client.defaults['HTTP_IF_NONE_MATCH'] = response['ETag']
+
+
+ROUTES = [
+    # --- Public ---
+    Route('home', 'core:home', login=False),
+    Route('home [cold cache]', 'core:home', login=False, setup=_clear_cache),
+    Route('contact-state', 'core:contact-state', login=False),
+    Route('api [projects]', 'core:api', login=False, args=lambda: ('projects',)),
+    Route('api [projects, cold cache]', 'core:api', login=False, args=lambda: ('projects',), setup=_clear_cache),
+    Route('api [projects, fields]', 'core:api', login=False, args=lambda: ('projects',),
+          data=lambda: {'fields': 'id,title,technologies'}),
+    Route('api [projects, 304]', 'core:api', login=False, args=lambda: ('projects',), setup=_api_etag),
+    Route('media [2 MB]', 'media', login=False, args=_media_file),
+    Route('media [range 64 KB]', 'media', login=False, args=_media_file, headers={'Range': 'bytes=0-65535'}),
+    Route('home [contact POST]', 'core:home', 'post', login=False, data=_contact_data, setup=_new_client_ip),
+    Route('home [contact POST, limited]', 'core:home', 'post', login=False, data=_contact_data,
+          setup=_exhaust_ip_bucket),
+    # --- Dashboard & auth ---
+    Route('dashboard', 'dashboard'),
+    Route('dashboard_login', 'dashboard_login', login=False),
+    Route('dashboard_login [POST]', 'dashboard_login', 'post', login=False,
+          data=lambda: {'username': 'benchmark', 'password': BENCHMARK_PASSWORD},
+          setup=lambda client: client.logout()),
+    Route('dashboard_login [POST, wrong password]', 'dashboard_login', 'post', login=False, data=_wrong_password,
+          setup=_new_client_ip),
+    Route('dashboard_login [POST, locked out]', 'dashboard_login', 'post', login=False,
+          data=lambda: {'username': 'benchmark', 'password': 'wrong-password'}, setup=_lock_out_ip),
+    Route('dashboard_logout', 'dashboard_logout'),
+    # --- HTMX partials ---
+    Route('load-personal-info', 'load-personal-info'),
+    Route('load-skills', 'load-skills'),
+    Route('load-experiences', 'load-experiences'),
+    Route('load-projects', 'load-projects'),
+    Route('load-messages', 'load-messages'),
+    Route('load-admins', 'load-admins'),
+    Route('search', 'search', data=lambda: {'q': 'lorem'}),
+    Route('load-metrics', 'load-metrics'),
+    Route('check-new-messages', 'check-new-messages'),
+    Route('message-events', 'message-events'),
+    # --- CRUD ---
+    Route('update-personal-info', 'update-personal-info', args=_first(PersonalInfo)),
+    Route('update-personal-info [POST]', 'update-personal-info', 'post', args=_first(PersonalInfo),
+          data=lambda: {'name': 'Benchmark User', 'title': 'Developer'}),
+    Route('create-project', 'create-project'),
+    Route('update-project', 'update-project', args=_first(Project)),
+    Route('update-project [POST]', 'update-project', 'post', args=_new_project, data=_project_data),
+    Route('delete-project [POST]', 'delete-project', 'post', args=_new_project),
+    Route('create-skill [POST]', 'create-skill', 'post', data=_unique_name),
+    Route('update-skill', 'update-skill', args=_first(Skill)),
+    Route('delete-skill [POST]', 'delete-skill', 'post', args=_new_skill),
+    Route('create-experience [POST]', 'create-experience', 'post', data=_experience_data),
+    Route('update-experience', 'update-experience', args=_first(Experience)),
+    Route('delete-experience [POST]', 'delete-experience', 'post', args=_new_experience),
+    Route('delete-message', 'delete-message', args=_first(ContactMessage)),
+    Route('delete-message [POST]', 'delete-message', 'post', args=_new_message),
+    Route('create-admin [POST]', 'create-admin', 'post', data=_admin_data),
+    Route('update-admin', 'update-admin', args=_new_staff),
+    Route('delete-admin [POST]', 'delete-admin', 'post', args=_new_staff),
+    # --- Exports ---
+    Route('export [messages csv]', 'export', args=lambda: ('messages',), data=lambda: {'format': 'csv'}),
+    Route('export [portfolio jsonl]', 'export', args=lambda: ('portfolio',), data=lambda: {'format': 'jsonl'}),
+    # --- Bulk actions ---
+    Route('bulk-delete-messages [100]', 'bulk-delete-messages', 'post', data=_message_ids),
+    Route('bulk-delete-skills [20]', 'bulk-delete-skills', 'post', data=_skill_ids),
+    Route('reorder-projects [all]', 'reorder-projects', 'post', data=_reversed_project_order),
+    Route('import-skills', 'import-skills'),
+    Route('import-skills [100 CSV]', 'import-skills', 'post', data=_import_file('skills.csv', SKILLS_CSV)),
+    Route('import-experiences [100 JSON]', 'import-experiences', 'post',
+          data=_import_file('experiences.json', EXPERIENCES_JSON)),
+]
+
+
+def uncovered_url_names(routes=ROUTES):
+    """Named routes in the URLconf that no benchmark Route exercises."""
+    covered = {route.url_name for route in routes}
+    names = set()
+    for pattern in get_resolver().url_patterns:
+        for sub in getattr(pattern, 'url_patterns', [pattern]):
+            if sub.name:
+                namespace = getattr(pattern, 'namespace', None)
+                names.add(f'{namespace}:{sub.name}' if namespace else sub.name)
+    return sorted(names - covered)
+
+
+# ==============================================================================
+#  MEASUREMENT & REPORTING
+# ==============================================================================
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_route(route, user, iterations=50, warmup=3):
+    """Requests `route` `iterations` times and returns its latency/query/size summary."""
+    client = Client()
+    timings, queries, sizes, statuses = [], [], [], set()
+    for i in range(warmup + iterations):
+        if route.login:
+            client.force_login(user)
+        route.setup(client)
+        url = reverse(route.url_name, args=route.args())
+        data = route.data()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = getattr(client, route.method)(url, data, headers=route.headers)
+            content = b''.join(response) if response.streaming else response.content
+            elapsed = time.perf_counter() - start
+        if i < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+        sizes.append(len(content))
+        statuses.add(response.status_code)
+
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'queries': max(queries),
+        'bytes': max(sizes),
+        'status': sorted(statuses),
+    }
+
+
+def compare_results(results, baseline, threshold=0.25, min_delta_ms=1.0):
+    """
+    Lists regressions of `results` against an earlier `baseline` run: more
+    queries, a bigger response or a p95 slower by more than `threshold`
+    (ignoring changes under `min_delta_ms`, which are mostly noise).
+    """
+    regressions = []
+    for label, now in results['routes'].items():
+        before = baseline.get('routes', {}).get(label)
+        if before is None:
+            continue
+        if now['queries'] > before['queries']:
+            regressions.append(f"{label}: queries {before['queries']} -> {now['queries']}")
+        delta = now['p95_ms'] - before['p95_ms']
+        if delta > min_delta_ms and delta > before['p95_ms'] * threshold:
+            regressions.append(f"{label}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now['bytes'] > before['bytes'] * (1 + threshold):
+            regressions.append(f"{label}: bytes {before['bytes']} -> {now['bytes']}")
+    return regressions
+
+
+# ==============================================================================
+#  SESSION STORE COST OF A POLLING ADMIN
+# ==============================================================================
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+def measure_session_queries(user, polls=12, engines=SESSION_ENGINES):
+    """
+    Replays one admin's dashboard visit (the dashboard, the inbox, then
+    `polls` check_new_messages polls) under each session engine and counts
+    the queries in total and those that touch django_session.
+    """
+    results = {}
+    for label, engine in engines.items():
+        with override_settings(SESSION_ENGINE=engine):
+            client = Client()
+            client.force_login(user)
+            with CaptureQueriesContext(connection) as captured:
+                client.get(reverse('dashboard'))
+                client.get(reverse('load-messages'))
+                for _ in range(polls):
+                    client.get(reverse('check-new-messages'))
+        results[label] = {
+            'queries': len(captured),
+            'session_queries': sum('django_session' in query['sql'] for query in captured),
+        }
+    return results
+
+
+# ==============================================================================
+#  LOGIN UNDER A CREDENTIAL-STUFFING BURST
+# ==============================================================================
+
+# attack -> attempt number -> (client IP, username)
+ATTACK_SHAPES = {
+    'one IP, many usernames': lambda i: ('198.51.100.1', f'stuffed-{i}'),
+    'one username, many IPs': lambda i: (f'10.9.{i >> 8 & 255}.{i & 255}', 'benchmark'),
+    'many IPs and usernames': lambda i: (f'10.8.{i >> 8 & 255}.{i & 255}', f'sprayed-{i}'),
+}
+
+def measure_login_attack(attempts=50, shapes=ATTACK_SHAPES):
+    """
+    Sends `attempts` wrong-password logins shaped like each attack and counts
+    how many reached the password hasher (authenticate() sends
+    user_login_failed once per hash) and the time and CPU they cost in total.
+    """
+    results = {}
+    for label, shape in shapes.items():
+        hashed = []
+        user_login_failed.connect(receiver := lambda **kwargs: hashed.append(1), weak=False)
+        client, statuses = Client(), Counter()
+        try:
+            wall, cpu = time.perf_counter(), time.process_time()
+            for i in range(attempts):
+                ip, username = shape(i)
+                response = client.post(reverse('dashboard_login'), {'username': username, 'password': 'wrong'},
+                                       REMOTE_ADDR=ip)
+                statuses[response.status_code] += 1
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        finally:
+            user_login_failed.disconnect(receiver)
+        results[label] = {
+            'attempts': attempts,
+            'hashed': len(hashed),
+            'rejected': statuses[429],
+            'elapsed_ms': round(wall * 1000, 1),
+            'cpu_ms': round(cpu * 1000, 1),
+        }
+    return results
+
+
+# ==============================================================================
+#  SERVER THROUGHPUT: UVICORN (ASGI) VS GUNICORN (WSGI)
+# ==============================================================================
+
+SERVER_ARGS = {
+    'uvicorn': lambda port, workers, threads: [
+        'uvicorn', 'portfolio_project.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--no-access-log',
+    ],
+    # More than one thread makes gunicorn use its gthread worker.
+    'gunicorn': lambda port, workers, threads: [
+        'gunicorn', 'portfolio_project.wsgi:application', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers), '--threads', str(threads),
+    ],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def running_server(server, workers=1, threads=4, timeout=30, env=None):
+    """
+    Starts `server` (a SERVER_ARGS key) on a free local port against the
+    configured database and yields the port once it accepts connections.
+    `env` adds environment variables, e.g. {'DATABASE_CONN_MODE': 'pool'}.
+    """
+    if importlib.util.find_spec(server) is None:
+        raise RuntimeError(f"{server} is not installed.")
+    port = _free_port()
+    process = subprocess.Popen([sys.executable, '-m', *SERVER_ARGS[server](port, workers, threads)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env={**os.environ, **(env or {})})
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{server} did not start.")
+                time.sleep(0.1)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # The server closes the connection after the body.
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _slow_client(port, stop):
+    """Trickles one header a second and never finishes, like a visitor on a bad mobile link."""
+    _, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(b'GET / HTTP/1.1\r\nHost: localhost\r\n')
+        while not stop.is_set():
+            writer.write(b'X-Slow: 1\r\n')
+            await writer.drain()
+            try:
+                await asyncio.wait_for(stop.wait(), 1)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        writer.close()
+
+
+async def measure_throughput(port, paths, requests=2000, concurrency=50, slow_clients=0, timeout=10):
+    """
+    Sends `requests` GETs (cycling through `paths`) from `concurrency`
+    clients at once while `slow_clients` connections hold the server open,
+    and returns the throughput, latency percentiles and status counts.
+    Requests still unanswered after `timeout` seconds count as 'timeout'.
+    """
+    stop = asyncio.Event()
+    holders = [asyncio.create_task(_slow_client(port, stop)) for _ in range(slow_clients)]
+    if holders:
+        await asyncio.sleep(1)  # Let every slow client get accepted first.
+
+    pending = itertools.islice(itertools.cycle(paths), requests)
+    timings, statuses = [], Counter()
+
+    async def client():
+        for path in pending:
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(_get(port, path), timeout)
+            except asyncio.TimeoutError:
+                status = 'timeout'
+            except (OSError, IndexError, ValueError):
+                status = 'error'
+            timings.append((time.perf_counter() - start) * 1000)
+            statuses[str(status)] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*holders, return_exceptions=True)
+
+    return {
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'status': dict(sorted(statuses.items())),
+    }
+
+
+def measure_connection_overhead(iterations=50):
+    """
+    What a request pays to get a database connection under the configured
+    DATABASE_CONN_MODE: each iteration ends a request the way Django does
+    (close_old_connections) and times the next one's first query. Opening a
+    brand-new connection is timed alongside for comparison.
+    """
+    new, per_request = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        connection.Database.connect(**connection.get_connection_params()).close()
+        new.append((time.perf_counter() - start) * 1000)
+
+        close_old_connections()
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        per_request.append((time.perf_counter() - start) * 1000)
+    return {
+        'mode': settings.DATABASE_CONN_MODE,
+        'vendor': connection.vendor,
+        'new_connection_p50_ms': round(percentile(new, 50), 3),
+        'per_request_p50_ms': round(percentile(per_request, 50), 3),
+        'per_request_p95_ms': round(percentile(per_request, 95), 3),
+    }
+
+
+# ==============================================================================
+#  COLD START: PROCESS SPAWN TO FIRST BYTE
+# ==============================================================================
+
+# Importing Django and the project (settings, apps, URLconf) must stay under
+# this; `benchmark_startup` fails when the median import time goes over it.
+# The median is the nearest-rank one from percentile(), so an odd number of
+# runs gives the middle run.
+STARTUP_IMPORT_BUDGET_MS = 1000
+
+# Run in a fresh interpreter: loads the WSGI application the way a server
+# worker does and serves one request through it. Times are wall-clock so the
+# parent can measure from the moment it spawned the process.
+STARTUP_SCRIPT = """
+import json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+started = time.time()
+os.environ['WARM_UP_ON_START'] = '0'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+from portfolio_project.wsgi import application
+imported = time.time()
+if sys.argv[2] == '1':
+    from core.warmup import warm_up
+    warm_up()
+warmed = time.time()
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+statuses = []
+body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+next(iter(body), b'')
+first_byte = time.time()
+body.close()
+print(json.dumps({'started': started, 'imported': imported, 'warmed': warmed, 'first_byte': first_byte,
+                  'status': int(statuses[0].split()[0])}))
+"""
+
+
+def measure_startup(path='/', warm_up=True, runs=5, env=None):
+    """
+    Spawns `runs` fresh processes that load the WSGI application (warming it
+    up first if `warm_up`) and serve `path` once, and returns the median
+    milliseconds spent starting the interpreter, importing the project,
+    warming up and serving the first request, plus the total from spawn to
+    first byte. `env` adds environment variables for the child processes.
+    """
+    steps = {name: [] for name in ('interpreter_ms', 'import_ms', 'warmup_ms', 'first_request_ms',
+                                   'time_to_first_byte_ms')}
+    statuses = set()
+    for _ in range(runs):
+        spawned = time.time()
+        result = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT, path, '1' if warm_up else '0'],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, env={**os.environ, **(env or {})},
+        )
+        if result.returncode:
+            raise RuntimeError(f"The startup probe failed:\n{result.stderr}")
+        times = json.loads(result.stdout.splitlines()[-1])
+        steps['interpreter_ms'].append(times['started'] - spawned)
+        steps['import_ms'].append(times['imported'] - times['started'])
+        steps['warmup_ms'].append(times['warmed'] - times['imported'])
+        steps['first_request_ms'].append(times['first_byte'] - times['warmed'])
+        steps['time_to_first_byte_ms'].append(times['first_byte'] - spawned)
+        statuses.add(times['status'])
+    summary = {name: round(percentile(values, 50) * 1000, 1) for name, values in steps.items()}
+    summary['status'] = sorted(statuses)
+    return summary
@@ -0,0 +1,132 @@
+# imad/core/bulk.py
+
+import contextvars
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_model_version, bump_portfolio_version
+from .forms import ExperienceForm
+from .models import Skill, Project, Experience, ContactMessage
+from .payload import rebuild_payload
+from .search import KIND_BY_MODEL, index_objects, remove_ids
+from .snapshot import schedule_snapshot
+
+
+# ==============================================================================
+#  ONE INVALIDATION PER BATCH
+# ==============================================================================
+
+# While set, the per-row receivers in core/signals.py do nothing; the bulk
+# operation does their work (search index, payload, cache versions) once per batch.
+bulk_operation = contextvars.ContextVar('bulk_operation', default=False)
+
+
+@contextmanager
+def _bulk(model):
+    """Runs a bulk write on `model` in one transaction, invalidating caches once on commit."""
+    token = bulk_operation.set(True)
+    try:
+        with transaction.atomic():
+            yield
+            if model is not ContactMessage:
+                # In the same transaction, so the payload commits with the rows.
+                rebuild_payload()
+            transaction.on_commit(lambda: _content_changed(model))
+    finally:
+        bulk_operation.reset(token)
+
+
+def _content_changed(model):
+    if model is not ContactMessage:
+        bump_portfolio_version()
+        schedule_snapshot()
+    bump_model_version(model)
+
+
+# ==============================================================================
+#  BULK DELETE & REORDER
+# ==============================================================================
+
+def delete_rows(model, ids):
+    """Deletes the `model` rows with these primary keys. Returns how many were deleted."""
+    with _bulk(model):
+        if model in KIND_BY_MODEL:
+            remove_ids(model, ids)
+        _, deleted = model.objects.filter(pk__in=ids).delete()
+    return deleted.get(model._meta.label, 0)
+
+
+def reorder_projects(ids):
+    """
+    Sets each project's `display_order` to its position in `ids` with one
+    `bulk_update`. Returns how many projects moved.
+    """
+    projects = Project.objects.only('pk', 'display_order').in_bulk(ids)
+    now = timezone.now()
+    moved = []
+    for position, pk in enumerate(ids):
+        project = projects.get(pk)
+        if project is not None and project.display_order != position:
+            project.display_order = position
+            project.updated_at = now
+            moved.append(project)
+    if moved:
+        with _bulk(Project):
+            Project.objects.bulk_update(moved, ['display_order', 'updated_at'])
+    return len(moved)
+
+
+# ==============================================================================
+#  BULK IMPORT (rows come from forms.BulkImportForm)
+# ==============================================================================
+
+def import_skills(rows):
+    """
+    Creates a Skill for every new `name` in `rows`; names that already exist
+    are skipped. Returns how many were created. Raises ValidationError,
+    importing nothing, if any row is invalid.
+    """
+    max_length = Skill._meta.get_field('name').max_length
+    names, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        name = str(row.get('name') or '').strip()
+        if not name:
+            errors.append(f"Row {number}: a name is required.")
+        elif len(name) > max_length:
+            errors.append(f"Row {number}: the name is longer than {max_length} characters.")
+        elif name not in names:
+            names.append(name)
+    if errors:
+        raise ValidationError(errors)
+
+    existing = set(Skill.objects.filter(name__in=names).values_list('name', flat=True))
+    new_skills = [Skill(name=name) for name in names if name not in existing]
+    with _bulk(Skill):
+        Skill.objects.bulk_create(new_skills, ignore_conflicts=True)
+    return len(new_skills)
+
+
+def import_experiences(rows):
+    """
+    Validates every row with ExperienceForm and creates them all with one
+    `bulk_create`. Returns how many were created. Raises ValidationError,
+    importing nothing, if any row is invalid.
+    """
+    experiences, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        form = ExperienceForm(data=row)
+        if form.is_valid():
+            experiences.append(form.save(commit=False))
+        else:
+            errors.extend(f"Row {number}: {field} - {error}"
+                          for field, field_errors in form.errors.items() for error in field_errors)
+    if errors:
+        raise ValidationError(errors)
+
+    with _bulk(Experience):
+        created = Experience.objects.bulk_create(experiences)
+        index_objects(created)
+    return len(created)
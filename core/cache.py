@@ -0,0 +1,212 @@
+# imad/core/cache.py
+
+import re
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import BaseCache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+
+# ==============================================================================
+#  PORTFOLIO CONTENT VERSION
+# ==============================================================================
+
+# A single global counter that changes whenever public portfolio content is
+# saved or deleted (see core/signals.py). Cache keys embed it, so a bump makes
+# every stale entry unreachable without having to delete anything.
+PORTFOLIO_VERSION_KEY = 'portfolio:version'
+
+
+def get_portfolio_version():
+    """Returns the current portfolio content version, initialising it if needed."""
+    version = cache.get(PORTFOLIO_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter never restarts at a value
+        # that an older cached page might still be stored under.
+        cache.add(PORTFOLIO_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(PORTFOLIO_VERSION_KEY)
+    return version
+
+
+async def aget_portfolio_version():
+    """get_portfolio_version() for async views."""
+    version = await cache.aget(PORTFOLIO_VERSION_KEY)
+    if version is None:
+        await cache.aadd(PORTFOLIO_VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(PORTFOLIO_VERSION_KEY)
+    return version
+
+
+def bump_portfolio_version():
+    """Invalidates everything keyed on the portfolio version."""
+    # A fresh clock value rather than incr(), which on the file cache would
+    # re-set the key with the default timeout (see incr_counter() below).
+    cache.set(PORTFOLIO_VERSION_KEY, time.time_ns(), None)
+
+
+# ==============================================================================
+#  COUNTERS THAT KEEP THEIR TIMEOUT
+# ==============================================================================
+
+# Redis, Memcached and LocMemCache increment a key in place and keep its
+# expiry. BaseCache.incr(), which the file and database caches inherit, is a
+# get() and a set() with the default timeout, so a counter there would expire
+# five minutes after its last increment whatever it was created with. On
+# those backends the count is stored as (count, expires_at) and every write
+# carries the remaining time over.
+#
+# Counters, rate limits and lockouts (core/spam.py, core/throttle.py) live in
+# the 'throttle' cache, so culling or clearing pages never resets them.
+throttle_cache = ConnectionProxy(caches, 'throttle')
+
+
+def _increments_in_place():
+    return type(caches['throttle']).incr is not BaseCache.incr
+
+
+def incr_counter(key, timeout=None):
+    """
+    Adds one to the counter at `key`, creating it to expire after `timeout`
+    seconds (None: never), and returns the new count.
+    """
+    if _increments_in_place():
+        try:
+            return throttle_cache.incr(key)
+        except ValueError:
+            if throttle_cache.add(key, 1, timeout):
+                return 1
+            return throttle_cache.incr(key)
+    now = time.time()
+    count, expires_at = throttle_cache.get(key) or (0, None)
+    if not count or (expires_at is not None and expires_at <= now):
+        count, expires_at = 0, (now + timeout if timeout is not None else None)
+    throttle_cache.set(key, (count + 1, expires_at), None if expires_at is None else expires_at - now)
+    return count + 1
+
+
+def _count(value):
+    return value[0] if isinstance(value, tuple) else value or 0
+
+
+def get_counter(key):
+    """The count at `key`, or 0."""
+    return _count(throttle_cache.get(key))
+
+
+def get_counters_many(keys):
+    """{key: count} for each of `keys` that holds a counter."""
+    return {key: _count(value) for key, value in throttle_cache.get_many(keys).items()}
+
+
+# ==============================================================================
+#  WHOLE-PAGE CACHE WITH PER-REQUEST HOLES
+# ==============================================================================
+
+PAGE_CACHE_TIMEOUT = 60 * 60
+
+# The cached page is rendered without a request. Anything that depends on the
+# visitor is left as a marker and filled in again on every response:
+#   - the CSRF token, via a placeholder passed in as `csrf_token`
+#   - any partial wrapped in `{% hole "template/name.html" %}` (portfolio_tags)
+CSRF_TOKEN_HOLE = '__portfolio_csrf_token__'
+HOLE_MARKER = '<!--portfolio-hole:{}-->'
+HOLE_PATTERN = re.compile(r'<!--portfolio-hole:([\w/.\-]+)-->')
+
+
+def fill_holes(content, request):
+    """Renders the per-request fragments of a cached page for this request."""
+    if CSRF_TOKEN_HOLE in content:
+        content = content.replace(CSRF_TOKEN_HOLE, get_token(request))
+    return HOLE_PATTERN.sub(lambda match: render_to_string(match.group(1), request=request), content)
+
+
+def get_cached_page(name, template_name, get_context):
+    """
+    Returns the cached, hole-punched HTML of `template_name`, rendering and
+    storing it with the context returned by `get_context()` only when the
+    portfolio version has changed since it was last rendered.
+    """
+    key = f'portfolio:page:{name}:{get_portfolio_version()}'
+    content = cache.get(key)
+    if content is None:
+        context = get_context()
+        context.update({'punch_holes': True, 'csrf_token': CSRF_TOKEN_HOLE})
+        content = render_to_string(template_name, context)
+        cache.set(key, content, PAGE_CACHE_TIMEOUT)
+    return content
+
+
+async def aget_cached_page(name, template_name, aget_context):
+    """
+    get_cached_page() for async views. `aget_context` is a coroutine function
+    whose context holds no lazy querysets, so rendering never queries.
+    """
+    key = f'portfolio:page:{name}:{await aget_portfolio_version()}'
+    content = await cache.aget(key)
+    if content is None:
+        context = await aget_context()
+        context.update({'punch_holes': True, 'csrf_token': CSRF_TOKEN_HOLE})
+        content = render_to_string(template_name, context)
+        await cache.aset(key, content, PAGE_CACHE_TIMEOUT)
+    return content
+
+
+async def arender_cached_page(request, name, template_name, aget_context):
+    """Serves `template_name` from the page cache with this request's holes filled in."""
+    return HttpResponse(fill_holes(await aget_cached_page(name, template_name, aget_context), request))
+
+
+# ==============================================================================
+#  PER-MODEL VERSIONS (validators for conditional HTMX partials)
+# ==============================================================================
+
+# One entry per model: an opaque `token` that changes on every save/delete
+# (see core/signals.py) and the newest `updated_at`, for Last-Modified.
+# Reading it costs a cache lookup, so a conditional request can be answered
+# with a 304 before any query runs.
+MODEL_VERSION_KEY = 'model-version:{}'
+
+
+def _version_aggregates(model):
+    aggregates = {'count': Count('pk')}
+    if any(field.name == 'updated_at' for field in model._meta.get_fields()):
+        aggregates['last_modified'] = Max('updated_at')
+    return aggregates
+
+
+def _version_from_stats(stats):
+    last_modified = stats.get('last_modified')
+    stamp = last_modified.timestamp() if last_modified else 0
+    return {'token': f"{stats['count']}.{stamp}", 'last_modified': last_modified}
+
+
+def get_model_version(model):
+    """Returns `{'token', 'last_modified'}` for `model`, computing it on a cache miss."""
+    key = MODEL_VERSION_KEY.format(model._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        version = _version_from_stats(model.objects.aggregate(**_version_aggregates(model)))
+        cache.add(key, version, None)
+    return version
+
+
+async def aget_model_version(model):
+    """get_model_version() for async views."""
+    key = MODEL_VERSION_KEY.format(model._meta.label_lower)
+    version = await cache.aget(key)
+    if version is None:
+        version = _version_from_stats(await model.objects.aaggregate(**_version_aggregates(model)))
+        await cache.aadd(key, version, None)
+    return version
+
+
+def bump_model_version(model):
+    """Gives `model` a fresh token and marks it modified now."""
+    cache.set(MODEL_VERSION_KEY.format(model._meta.label_lower),
+              {'token': str(time.time_ns()), 'last_modified': timezone.now()}, None)
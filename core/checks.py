@@ -0,0 +1,24 @@
+# imad/core/checks.py
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .management.commands.build_css import OUTPUT
+
+
+# ==============================================================================
+#  SYSTEM CHECKS
+# ==============================================================================
+
+@register()
+def check_stylesheet(app_configs, **kwargs):
+    """Warns in development when the compiled stylesheet hasn't been built yet."""
+    # portfolio.css is gitignored; without it every page renders unstyled.
+    # Production builds it in build.sh, where collectstatic fails loudly anyway.
+    if not settings.DEBUG or OUTPUT.exists():
+        return []
+    return [Warning(
+        f"{OUTPUT} is missing, so pages render without styles.",
+        hint="Run `python manage.py build_css` (or `build_css --watch` while editing templates).",
+        id='core.W001',
+    )]
@@ -0,0 +1,66 @@
+# imad/core/events.py
+
+import asyncio
+import threading
+
+
+# ==============================================================================
+#  IN-PROCESS BROADCAST HUB FOR DASHBOARD EVENTS
+# ==============================================================================
+
+class BroadcastHub:
+    """
+    Fans events out to every connected dashboard stream in this process.
+
+    Subscribers are asyncio queues living on the ASGI event loop; `publish()`
+    may be called from any thread (e.g. a sync view saving a ContactForm), so
+    events are handed to each loop with `call_soon_threadsafe`.
+
+    The hub is per process. With several server processes a dashboard only
+    hears about messages saved by the process it is connected to, which is why
+    the dashboard keeps polling `check_new_messages`, more slowly, while its
+    stream is open.
+    """
+
+    def __init__(self, max_queued_events=100):
+        self.max_queued_events = max_queued_events
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Registers a new subscriber queue. Must be called on the event loop."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.max_queued_events))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber[1]
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = {s for s in self._subscribers if s[1] is not queue}
+
+    def publish(self, *events):
+        """Queues `events` for every subscriber. Safe to call from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            for event in events:
+                try:
+                    loop.call_soon_threadsafe(self._deliver, queue, event)
+                except RuntimeError:
+                    # The subscriber's loop has already been closed.
+                    self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue, event):
+        # A dashboard that is not reading only misses refresh hints, so drop
+        # rather than let its backlog grow without bound.
+        if not queue.full():
+            queue.put_nowait(event)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+# The hub that `core.signals` publishes new contact messages to.
+message_hub = BroadcastHub()
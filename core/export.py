@@ -0,0 +1,143 @@
+# imad/core/export.py
+
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from .models import PersonalInfo, Skill, Project, Experience, ContactMessage
+
+
+# ==============================================================================
+#  WHAT CAN BE EXPORTED
+# ==============================================================================
+
+# dataset -> (model, exported fields)
+DATASETS = {
+    'messages': (ContactMessage, ['id', 'name', 'email', 'message', 'sent_at']),
+    'personal-info': (PersonalInfo, ['id', 'name', 'title', 'bio', 'email', 'github_url', 'linkedin_url',
+                                     'profile_image', 'cv', 'updated_at']),
+    'skills': (Skill, ['id', 'name', 'updated_at']),
+    'projects': (Project, ['id', 'title', 'description', 'technologies', 'image', 'github_link', 'live_link',
+                           'display_order', 'updated_at']),
+    'experiences': (Experience, ['id', 'category', 'title', 'company', 'start_date', 'end_date',
+                                 'description', 'updated_at']),
+}
+# `portfolio` exports all of these into one JSONL file, tagged by `type`.
+PORTFOLIO_DATASETS = ['personal-info', 'skills', 'projects', 'experiences']
+EXPORT_FORMATS = {'csv': 'text/csv; charset=utf-8', 'jsonl': 'application/x-ndjson'}
+
+# Rows fetched per query, and lines joined into each chunk sent to the client.
+# Together they bound the memory an export uses, whatever the table size.
+EXPORT_CHUNK_SIZE = 2000
+LINES_PER_WRITE = 200
+
+
+def export_querysets(dataset, fmt, start=None, end=None):
+    """
+    Returns the [(dataset, queryset)] to export. `start`/`end` are inclusive
+    dates that limit messages by `sent_at`. Raises ValueError for a request
+    that can't be exported.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'; use csv or jsonl.")
+    if dataset == 'portfolio':
+        if fmt != 'jsonl':
+            raise ValueError("The full portfolio can only be exported as jsonl.")
+        return [(name, _queryset(name)) for name in PORTFOLIO_DATASETS]
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'.")
+
+    queryset = _queryset(dataset)
+    if dataset == 'messages':
+        # Compare against datetimes rather than `sent_at__date` so the inbox index is used.
+        if start:
+            queryset = queryset.filter(sent_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        if end:
+            queryset = queryset.filter(sent_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)))
+    return [(dataset, queryset)]
+
+
+def _queryset(dataset):
+    model, fields = DATASETS[dataset]
+    queryset = model.objects.all()
+    if 'technologies' in fields:
+        queryset = queryset.prefetch_related('technologies')
+    return queryset
+
+
+# ==============================================================================
+#  FORMATTING
+# ==============================================================================
+
+class Echo:
+    """A file-like object that hands back whatever csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _to_row(obj, fields):
+    row = {}
+    for field in fields:
+        value = getattr(obj, field)
+        if field == 'technologies':
+            value = [skill.name for skill in value.all()]
+        elif isinstance(value, FieldFile):
+            value = value.name or ''
+        row[field] = value
+    return row
+
+
+def _csv_cell(value):
+    if isinstance(value, list):
+        value = '; '.join(value)
+    if value is None:
+        return ''
+    value = str(value)
+    # Contact messages are written by the public; don't let a spreadsheet run them as formulas.
+    if value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        value = "'" + value
+    return value
+
+
+def _formatter(dataset, fmt):
+    """Returns the (header, format_row) pair that turns objects into lines."""
+    fields = DATASETS[dataset][1]
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        return writer.writerow(fields), lambda obj: writer.writerow([_csv_cell(v) for v in _to_row(obj, fields).values()])
+    return '', lambda obj: json.dumps({'type': dataset, **_to_row(obj, fields)}, cls=DjangoJSONEncoder) + '\n'
+
+
+# ==============================================================================
+#  STREAMS (sync for WSGI, async for ASGI)
+# ==============================================================================
+
+def stream_export(querysets, fmt):
+    """Yields the export in chunks of LINES_PER_WRITE lines."""
+    for dataset, queryset in querysets:
+        header, format_row = _formatter(dataset, fmt)
+        lines = [header]
+        for obj in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            lines.append(format_row(obj))
+            if len(lines) >= LINES_PER_WRITE:
+                yield ''.join(lines)
+                lines = []
+        yield ''.join(lines)
+
+
+async def astream_export(querysets, fmt):
+    """Like stream_export, but fetches rows without holding a thread between chunks."""
+    for dataset, queryset in querysets:
+        header, format_row = _formatter(dataset, fmt)
+        lines = [header]
+        async for obj in queryset.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            lines.append(format_row(obj))
+            if len(lines) >= LINES_PER_WRITE:
+                yield ''.join(lines)
+                lines = []
+        yield ''.join(lines)
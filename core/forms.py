@@ -1,5 +1,9 @@
 # imad_portfolio/core/forms.py
 
+import csv
+import io
+import json
+
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
@@ -7,6 +11,11 @@ from .models import ContactMessage, Project, Skill, PersonalInfo, Experience
 
 # --- PUBLIC CONTACT FORM ---
 class ContactForm(forms.ModelForm):
+    # Spam traps checked by core/spam.py: a field only bots fill in, and the
+    # signed time the form was shown (see contact_form_guard.html).
+    website = forms.CharField(required=False)
+    form_token = forms.CharField(required=False)
+
     class Meta:
         model = ContactMessage
         fields = ['name', 'email', 'message']
@@ -73,4 +82,34 @@ class AdminCreationForm(UserCreationForm):
 class AdminChangeForm(forms.ModelForm):
     class Meta:
         model = User; fields = ('username', 'email', 'is_staff', 'is_superuser')
-        widgets = {'username': forms.TextInput(attrs={'class': 'w-full bg-gray-700 text-white rounded p-2 border border-gray-600'}),'email': forms.EmailInput(attrs={'class': 'w-full bg-gray-700 text-white rounded p-2 border border-gray-600'}),'is_staff': forms.CheckboxInput(attrs={'class': 'h-5 w-5 text-indigo-500 bg-gray-700 border-gray-600 rounded'}),'is_superuser': forms.CheckboxInput(attrs={'class': 'h-5 w-5 text-indigo-500 bg-gray-700 border-gray-600 rounded'})}
\ No newline at end of file
+        widgets = {'username': forms.TextInput(attrs={'class': 'w-full bg-gray-700 text-white rounded p-2 border border-gray-600'}),'email': forms.EmailInput(attrs={'class': 'w-full bg-gray-700 text-white rounded p-2 border border-gray-600'}),'is_staff': forms.CheckboxInput(attrs={'class': 'h-5 w-5 text-indigo-500 bg-gray-700 border-gray-600 rounded'}),'is_superuser': forms.CheckboxInput(attrs={'class': 'h-5 w-5 text-indigo-500 bg-gray-700 border-gray-600 rounded'})}
+
+# --- BULK IMPORT (see core/bulk.py) ---
+class BulkImportForm(forms.Form):
+    """A CSV file with a header row, or a JSON array of objects, parsed into a list of dicts."""
+    MAX_ROWS = 5000
+
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={'class': 'w-full bg-gray-700 text-white rounded p-2 border border-gray-600', 'accept': '.csv,.json'}))
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        try:
+            text = upload.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise forms.ValidationError("The file must be UTF-8 encoded.")
+
+        if upload.name.lower().endswith('.json'):
+            try:
+                rows = json.loads(text)
+            except ValueError as e:
+                raise forms.ValidationError(f"Invalid JSON: {e}")
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise forms.ValidationError("The JSON file must contain an array of objects.")
+        else:
+            rows = list(csv.DictReader(io.StringIO(text)))
+
+        if not rows:
+            raise forms.ValidationError("The file has no rows to import.")
+        if len(rows) > self.MAX_ROWS:
+            raise forms.ValidationError(f"Import at most {self.MAX_ROWS} rows at a time.")
+        return rows
@@ -0,0 +1,162 @@
+# imad/core/images.py
+
+import asyncio
+import functools
+import io
+import logging
+import posixpath
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .cache import bump_portfolio_version
+from .snapshot import schedule_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+#  RESPONSIVE IMAGE DERIVATIVES
+# ==============================================================================
+
+# Widths (in px) generated for every uploaded image; never wider than the original.
+DERIVATIVE_WIDTHS = (320, 640, 1024, 1600)
+DERIVATIVE_DIR = 'derivatives'
+
+@functools.cache
+def derivative_formats():
+    """
+    The formats derivatives are built in. AVIF needs a Pillow build (or
+    plugin) with an AVIF encoder; WebP is always built in. Pillow is only
+    imported here and in build_derivatives, off the worker's startup path.
+    """
+    from PIL import Image
+    Image.init()
+    return [fmt for fmt in ('avif', 'webp') if fmt.upper() in Image.SAVE]
+
+
+# Derivatives are generated one image at a time, off the request thread.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+_scheduled = set()
+_scheduled_lock = threading.Lock()
+# Set once a build finished since the portfolio version was last bumped.
+_built = threading.Event()
+
+
+def derivative_manifest_key(name):
+    return f'image-derivatives:{name}'
+
+
+def get_derivatives(name):
+    """
+    Returns the cached {format: [(url, width), ...]} manifest for the stored
+    image `name`, or None if it hasn't been built yet. Never touches storage.
+    """
+    if not name:
+        return None
+    return cache.get(derivative_manifest_key(name))
+
+
+def derivative_name(name, width, fmt):
+    root, _ = posixpath.splitext(name)
+    return f'{DERIVATIVE_DIR}/{root}-{width}w.{fmt}'
+
+
+def delete_derivatives(name):
+    """Removes every derivative of `name` from storage, along with its manifest."""
+    directory, root = posixpath.split(f'{DERIVATIVE_DIR}/{posixpath.splitext(name)[0]}')
+    pattern = re.compile(rf'{re.escape(root)}-\d+w\.\w+')
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        files = []
+    for filename in files:
+        if pattern.fullmatch(filename):
+            default_storage.delete(f'{directory}/{filename}')
+    cache.delete(derivative_manifest_key(name))
+
+
+def build_derivatives(name):
+    """
+    Writes any missing derivatives of `name` to storage and caches the
+    manifest. Existing files are reused, so rebuilding a lost manifest is cheap.
+    """
+    from PIL import Image, ImageOps
+
+    with default_storage.open(name) as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+
+    widths = sorted({min(width, original.width) for width in DERIVATIVE_WIDTHS})
+    manifest = {fmt: [] for fmt in derivative_formats()}
+    for width in widths:
+        resized = None
+        for fmt in derivative_formats():
+            target = derivative_name(name, width, fmt)
+            if not default_storage.exists(target):
+                if resized is None:
+                    height = round(original.height * width / original.width)
+                    resized = original.resize((width, height), Image.LANCZOS)
+                    if resized.mode not in ('RGB', 'RGBA'):
+                        resized = resized.convert('RGBA' if 'A' in resized.getbands() else 'RGB')
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=80)
+                default_storage.save(target, ContentFile(buffer.getvalue()))
+            manifest[fmt].append((default_storage.url(target), width))
+
+    cache.set(derivative_manifest_key(name), manifest, None)
+    return manifest
+
+
+def _build_in_background(name):
+    try:
+        build_derivatives(name)
+        _built.set()
+    except FileNotFoundError:
+        # Remember that there is nothing to build so rendering stops retrying.
+        cache.set(derivative_manifest_key(name), {}, None)
+        logger.warning("Image %s is missing from storage; no derivatives built.", name)
+    except Exception:
+        logger.exception("Could not build image derivatives for %s.", name)
+    finally:
+        with _scheduled_lock:
+            _scheduled.discard(name)
+            idle = not _scheduled
+        if idle and _built.is_set():
+            # Cached pages were rendered without the new srcsets. Bumping once
+            # the queue is empty, so a page with N new images costs one bump
+            # and one snapshot rather than N.
+            _built.clear()
+            bump_portfolio_version()
+            schedule_snapshot()
+
+
+def schedule_derivatives(name):
+    """
+    Queues `build_derivatives(name)` to run once the current transaction
+    commits. With no usable format it builds an empty manifest, which stops
+    later renders from scheduling it again.
+    """
+    if not name:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        transaction.on_commit(lambda: _submit(name))
+    else:
+        # Rendered by an async view: there is no transaction to wait for, and
+        # touching the connection from the event loop isn't allowed.
+        _submit(name)
+
+
+def _submit(name):
+    with _scheduled_lock:
+        if name in _scheduled:
+            return
+        _scheduled.add(name)
+    _executor.submit(_build_in_background, name)
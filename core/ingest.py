@@ -0,0 +1,153 @@
+# imad/core/ingest.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .bulk import bulk_operation
+from .events import message_hub
+from .models import ContactMessage
+from .search import index_objects
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+#  BUFFERED CONTACT MESSAGE WRITER
+# ==============================================================================
+
+class ContactMessageQueue:
+    """
+    Buffers contact form submissions in memory and writes them with
+    `bulk_create` from a single background thread, so a burst of submissions
+    uses one database connection instead of one per request.
+
+    A batch is written once `batch_size` messages are waiting or the oldest
+    one has waited `flush_interval` seconds. Pending messages are drained when
+    the process exits normally. When `settings.CONTACT_INGEST_ASYNC` is off,
+    `put()` simply saves the message in the calling thread.
+    """
+
+    def __init__(self, max_size=1000, batch_size=100, flush_interval=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_size)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._exit_handler_registered = False
+
+    def put(self, message):
+        """
+        Accepts an unsaved ContactMessage. Returns False when the buffer is
+        full, in which case the message was not stored.
+        """
+        if not settings.CONTACT_INGEST_ASYNC:
+            message.save()
+            return True
+        message.sent_at = timezone.now()
+        self.start()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            return False
+        return True
+
+    def start(self):
+        """Starts the writer thread if it isn't running yet."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='contact-message-writer', daemon=True)
+            self._thread.start()
+            if not self._exit_handler_registered:
+                atexit.register(self.stop)
+                self._exit_handler_registered = True
+
+    def stop(self, timeout=10):
+        """Stops the writer thread after it has written everything pending."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopping.set()
+        thread.join(timeout)
+        self._stopping.clear()
+
+    def flush(self):
+        """Writes every pending message in the calling thread. Returns the count."""
+        written = 0
+        while batch := self._take(self.batch_size, block=False):
+            written += self._write(batch)
+        return written
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                if batch := self._take(self.batch_size, block=True):
+                    self._write(batch)
+            self.flush()
+        finally:
+            connection.close()
+
+    def _take(self, limit, block):
+        """Collects up to `limit` messages, waiting at most `flush_interval`."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < limit:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            with transaction.atomic():
+                ContactMessage.objects.bulk_create(batch)
+                # bulk_create skips post_save, so index the batch here too.
+                index_objects(batch)
+        except Exception:
+            # Don't let one bad row lose the rest of the batch.
+            logger.exception("Bulk write of %d contact messages failed; saving one by one.", len(batch))
+            saved = []
+            # Keep the per-row receivers from publishing once per message.
+            token = bulk_operation.set(True)
+            try:
+                for message in batch:
+                    try:
+                        message.save()
+                        saved.append(message)
+                    except Exception:
+                        logger.exception("Dropping contact message from %s.", message.email)
+                index_objects(saved)
+            finally:
+                bulk_operation.reset(token)
+            written = len(saved)
+        else:
+            written = len(batch)
+        finally:
+            connection.close_if_unusable_or_obsolete()
+
+        # Neither path lets post_save publish, so notify dashboards once here.
+        if written:
+            message_hub.publish('newMessage', 'messages-changed')
+        return written
+
+
+# The queue `core.views.home` hands validated contact messages to.
+contact_message_queue = ContactMessageQueue()
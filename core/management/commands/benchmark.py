@@ -0,0 +1,119 @@
+# imad/core/management/commands/benchmark.py
+
+import json
+import platform
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core.benchmark import (
+    ROUTES, compare_results, measure_login_attack, measure_session_queries, run_route, seed_dataset,
+    uncovered_url_names,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic dataset into a throwaway test database and measures "
+        "latency (p50/p95/p99), queries per request and response size for every route."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1,
+                            help="Multiplies the default dataset (100 projects/skills/experiences, "
+                                 "1000 messages, 10 staff users).")
+        for name in ('projects', 'skills', 'experiences', 'messages', 'staff'):
+            parser.add_argument(f'--{name}', type=int, help=f"Number of {name} to seed (overrides --scale).")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--route', action='append', dest='routes',
+                            help="Only run routes whose label contains this text (repeatable).")
+        parser.add_argument('--polls', type=int, default=12,
+                            help="check_new_messages polls in the session store comparison (default 12, "
+                                 "one minute of dashboard polling).")
+        parser.add_argument('--login-attempts', type=int, default=50,
+                            help="Wrong-password logins sent per attack shape (default 50).")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--compare', help="Flag regressions against an earlier JSON result file.")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Relative p95/size growth counted as a regression (default 0.25).")
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        dataset = {
+            'projects': 100 * scale, 'skills': 100 * scale, 'experiences': 100 * scale,
+            'messages': 1000 * scale, 'staff': 10 * scale,
+        }
+        dataset.update({name: options[name] for name in dataset if options[name] is not None})
+        routes = [r for r in ROUTES if not options['routes'] or any(text in r.label for text in options['routes'])]
+
+        for name in uncovered_url_names():
+            self.stderr.write(self.style.WARNING(f"No benchmark covers the '{name}' route."))
+
+        media_root = tempfile.mkdtemp()
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            # Write contact messages inline so they are measured in the request,
+            # and keep benchmark uploads out of the real MEDIA_ROOT.
+            with override_settings(CONTACT_INGEST_ASYNC=False, MEDIA_ROOT=media_root):
+                user = seed_dataset(**dataset)
+                results = {
+                    'meta': {
+                        'created': datetime.now(timezone.utc).isoformat(),
+                        'database': connection.vendor,
+                        'django': django.get_version(),
+                        'python': platform.python_version(),
+                        'dataset': dataset,
+                        'iterations': options['iterations'],
+                    },
+                    'routes': {},
+                }
+                for route in routes:
+                    summary = run_route(route, user, options['iterations'], options['warmup'])
+                    results['routes'][route.label] = summary
+                    self.stdout.write(
+                        f"{route.label:<32} p50 {summary['p50_ms']:>8.2f}ms  p95 {summary['p95_ms']:>8.2f}ms  "
+                        f"p99 {summary['p99_ms']:>8.2f}ms  {summary['queries']:>3} queries  "
+                        f"{summary['bytes']:>8} bytes  {summary['status']}"
+                    )
+
+                results['sessions'] = measure_session_queries(user, options['polls'])
+                db_queries = results['sessions']['db']['session_queries']
+                self.stdout.write(f"\nSession store, one admin: dashboard + inbox + {options['polls']} polls")
+                for engine, summary in results['sessions'].items():
+                    self.stdout.write(
+                        f"{engine:<32} {summary['queries']:>4} queries  {summary['session_queries']:>4} on "
+                        f"django_session  ({db_queries - summary['session_queries']} eliminated vs db)"
+                    )
+
+                results['login_attack'] = measure_login_attack(options['login_attempts'])
+                self.stdout.write(f"\nLogin under attack: {options['login_attempts']} wrong passwords per shape")
+                for shape, summary in results['login_attack'].items():
+                    self.stdout.write(
+                        f"{shape:<32} {summary['hashed']:>4} hashed  {summary['rejected']:>4} rejected  "
+                        f"{summary['cpu_ms']:>9.1f}ms CPU  {summary['elapsed_ms']:>9.1f}ms"
+                    )
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                regressions = compare_results(results, json.load(f), options['threshold'])
+            if regressions:
+                raise CommandError("Performance regressions:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
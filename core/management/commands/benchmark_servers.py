@@ -0,0 +1,70 @@
+# imad/core/management/commands/benchmark_servers.py
+
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import SERVER_ARGS, measure_connection_overhead, measure_throughput, running_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares concurrent throughput of the read paths under uvicorn (ASGI) and "
+        "gunicorn (WSGI), optionally while slow clients hold connections open. The "
+        "servers use the configured database, so migrate and add some content first. "
+        "Point DATABASE_URL at a local PostgreSQL container to compare connection modes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', action='append', dest='servers', choices=sorted(SERVER_ARGS),
+                            help="Only benchmark this server (repeatable; default: all).")
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="Request this path (repeatable; default: / and /htmx/check-new-messages/).")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--slow-clients', type=int, default=0,
+                            help="Connections that trickle their headers for the whole run.")
+        parser.add_argument('--workers', type=int, default=1, help="Worker processes per server (default 1).")
+        parser.add_argument('--threads', type=int, default=4, help="gunicorn threads per worker (default 4).")
+        parser.add_argument('--conn-mode', action='append', dest='conn_modes',
+                            choices=['persistent', 'pool', 'none'],
+                            help="Run the servers with this DATABASE_CONN_MODE (repeatable; default: as configured). "
+                                 "pool needs PostgreSQL.")
+        parser.add_argument('--timeout', type=float, default=10, help="Seconds before a request counts as timed out.")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/', '/htmx/check-new-messages/']
+        overhead = measure_connection_overhead()
+        self.stdout.write(
+            f"Database ({overhead['vendor']}, {overhead['mode']}): new connection p50 "
+            f"{overhead['new_connection_p50_ms']:.2f}ms, per request p50 {overhead['per_request_p50_ms']:.2f}ms "
+            f"p95 {overhead['per_request_p95_ms']:.2f}ms\n"
+        )
+        results = {'connection_overhead': overhead}
+        for conn_mode in options['conn_modes'] or [None]:
+            env = {'DATABASE_CONN_MODE': conn_mode} if conn_mode else None
+            for server in options['servers'] or sorted(SERVER_ARGS):
+                label = f'{server} [{conn_mode}]' if conn_mode else server
+                try:
+                    with running_server(server, options['workers'], options['threads'], env=env) as port:
+                        # One warm-up pass so every worker has imported and connected.
+                        asyncio.run(measure_throughput(port, paths, requests=len(paths) * 10, concurrency=4))
+                        summary = asyncio.run(measure_throughput(
+                            port, paths, options['requests'], options['concurrency'],
+                            options['slow_clients'], options['timeout'],
+                        ))
+                except RuntimeError as e:
+                    raise CommandError(str(e))
+                results[label] = summary
+                statuses = ', '.join(f'{status}: {count}' for status, count in summary['status'].items())
+                self.stdout.write(
+                    f"{label:<24} {summary['requests_per_second']:>8.1f} req/s  p50 {summary['p50_ms']:>8.2f}ms  "
+                    f"p95 {summary['p95_ms']:>8.2f}ms  p99 {summary['p99_ms']:>8.2f}ms  {statuses}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
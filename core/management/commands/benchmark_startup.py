@@ -0,0 +1,48 @@
+# imad/core/management/commands/benchmark_startup.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import STARTUP_IMPORT_BUDGET_MS, measure_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures cold start: the time from spawning a worker process to the first byte "
+        "of its first response, with and without the warm-up (core/warmup.py). Fails if "
+        "importing the project takes longer than the budget. Uses the configured database, "
+        "so migrate first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help="Path of the first request (default /).")
+        parser.add_argument('--runs', type=int, default=5, help="Processes spawned per variant (default 5).")
+        parser.add_argument('--max-import-ms', type=float, default=STARTUP_IMPORT_BUDGET_MS,
+                            help=f"Median import time allowed (default {STARTUP_IMPORT_BUDGET_MS}).")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        results = {}
+        for label, warm_up in (('no warm-up', False), ('warm-up', True)):
+            try:
+                summary = measure_startup(options['path'], warm_up, options['runs'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            results[label] = summary
+            self.stdout.write(
+                f"{label:<12} interpreter {summary['interpreter_ms']:>7.1f}ms  import {summary['import_ms']:>7.1f}ms  "
+                f"warm-up {summary['warmup_ms']:>7.1f}ms  first request {summary['first_request_ms']:>7.1f}ms  "
+                f"spawn to first byte {summary['time_to_first_byte_ms']:>7.1f}ms  {summary['status']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        import_ms = max(summary['import_ms'] for summary in results.values())
+        if import_ms > options['max_import_ms']:
+            raise CommandError(f"Importing the project took {import_ms:.1f}ms, over the "
+                               f"{options['max_import_ms']:.0f}ms budget.")
+        self.stdout.write(self.style.SUCCESS(f"Import time {import_ms:.1f}ms is within budget."))
@@ -0,0 +1,43 @@
+# imad/core/management/commands/build_css.py
+
+import os
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TAILWIND_DIR = settings.BASE_DIR / 'core' / 'tailwind'
+OUTPUT = settings.BASE_DIR / 'core' / 'static' / 'core' / 'css' / 'portfolio.css'
+# The templates were written against the Tailwind 3 runtime from cdn.tailwindcss.com.
+TAILWIND_VERSION = 'v3.4.17'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles the Tailwind stylesheet from the classes used in the templates and form "
+        "widgets, purged and minified, into core/static/core/css/portfolio.css. build.sh runs "
+        "it before collectstatic, which hashes and compresses the result."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help="Keep rebuilding as templates change.")
+
+    def handle(self, *args, **options):
+        cli = shutil.which(settings.TAILWIND_CLI)
+        if cli is None:
+            raise CommandError(
+                f"Tailwind CLI '{settings.TAILWIND_CLI}' not found. Install it with "
+                "`pip install pytailwindcss` or point TAILWIND_CLI at the standalone binary."
+            )
+        command = [
+            cli, '--config', str(TAILWIND_DIR / 'tailwind.config.js'), '--input', str(TAILWIND_DIR / 'input.css'),
+            '--output', str(OUTPUT), '--minify',
+        ]
+        if options['watch']:
+            command.append('--watch')
+        # pytailwindcss downloads this version of the binary on first use.
+        env = {'TAILWINDCSS_VERSION': TAILWIND_VERSION, **os.environ}
+        if subprocess.run(command, env=env).returncode:
+            raise CommandError("The Tailwind CLI failed.")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {OUTPUT} ({OUTPUT.stat().st_size} bytes)."))
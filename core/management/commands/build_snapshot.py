@@ -0,0 +1,21 @@
+# imad/core/management/commands/build_snapshot.py
+
+from django.core.management.base import BaseCommand
+
+from core.snapshot import build_snapshot, snapshot_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the public homepage to a static HTML file under PORTFOLIO_SNAPSHOT_ROOT, "
+        "if portfolio content changed since the last snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Rebuild even if the snapshot is up to date.")
+
+    def handle(self, *args, **options):
+        if build_snapshot(force=options['force']):
+            self.stdout.write(self.style.SUCCESS(f"Snapshot written to {snapshot_path()}"))
+        else:
+            self.stdout.write(f"Snapshot at {snapshot_path()} is up to date.")
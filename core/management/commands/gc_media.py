@@ -0,0 +1,27 @@
+# imad/core/management/commands/gc_media.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.media import collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes uploaded files and image derivatives in MEDIA_ROOT that no "
+        "project or personal info row references any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="List the orphaned files without deleting them.")
+        parser.add_argument('--min-age', type=float, default=24,
+                            help="Only delete files older than this many hours (default 24), so uploads "
+                                 "whose row isn't committed yet are kept.")
+
+    def handle(self, *args, **options):
+        deleted = collect_garbage(timedelta(hours=options['min_age']), dry_run=options['dry_run'])
+        for name in deleted:
+            self.stdout.write(name)
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(deleted)} orphaned file(s)."))
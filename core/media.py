@@ -0,0 +1,235 @@
+# imad/core/media.py
+
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+
+from .images import DERIVATIVE_DIR, delete_derivatives, derivative_manifest_key
+from .models import PersonalInfo, Project
+from .storage import ContentHashedStorage, content_storage
+
+
+# ==============================================================================
+#  MEDIA FILES IN PRODUCTION (CV, project and profile images)
+# ==============================================================================
+
+# Names that embed a hash of their content (`photo.3f2a9c1b7e4d.png`,
+# `blobs/3f/3f2a9c1b7e4d5e6f.png` and its `-640w.webp` derivatives) never
+# change, so browsers may keep them for good. Anything else is revalidated
+# after MEDIA_CACHE_MAX_AGE.
+CONTENT_HASHED_NAME = re.compile(r'(^|[/.])[0-9a-f]{12,}(-\d+w)?\.\w+$')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    Reads at most `length` bytes of `file` from its current position. It
+    still exposes the real `fileno()`, so a server with sendfile support
+    (e.g. gunicorn) sends the range straight from the page cache, bounded
+    by Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Returns the (start, end) byte positions (inclusive) of a single-range
+    `Range` header, None if the header should be ignored, or raises
+    ValueError if the range can't be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None  # Malformed or multiple ranges: send the whole file.
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1  # The last `last` bytes.
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def serve(request, path):
+    """
+    Serves `path` from MEDIA_ROOT with ETag/Last-Modified revalidation,
+    single-range requests and cache headers. With MEDIA_ACCEL_REDIRECT_PREFIX
+    set, the file is handed to the front proxy via X-Accel-Redirect instead.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Media file not found")
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        # The proxy handles Range and conditional requests itself.
+        response = HttpResponse(content_type=mimetypes.guess_type(full_path)[0] or 'application/octet-stream')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + path.lstrip('/')
+        return _with_cache_headers(response, path)
+
+    try:
+        stat_result = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("Media file not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404("Media file not found")
+
+    size = stat_result.st_size
+    etag = quote_etag(f'{stat_result.st_mtime_ns:x}-{size:x}')
+    last_modified = int(stat_result.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return _with_cache_headers(response, path)
+
+    byte_range = None
+    if 'Range' in request.headers and request.headers.get('If-Range', etag) == etag:
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(FileRange(file, end - start + 1), status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return _with_cache_headers(response, path)
+
+
+def _with_cache_headers(response, path):
+    if CONTENT_HASHED_NAME.search(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+# ==============================================================================
+#  UPLOAD REFERENCE COUNTING & GARBAGE COLLECTION
+# ==============================================================================
+
+# Every field that stores uploads in `content_storage`. Identical uploads
+# share one blob, so a file can only be deleted once none of these
+# reference it.
+UPLOAD_FIELDS = {
+    PersonalInfo: ['profile_image', 'cv'],
+    Project: ['image'],
+}
+
+DERIVATIVE_NAME = re.compile(rf'^{DERIVATIVE_DIR}/(?P<root>.+)-\d+w\.\w+$')
+
+
+def count_references(name):
+    """Returns how many rows reference the stored file `name`."""
+    return sum(
+        model._default_manager.filter(**{field: name}).count()
+        for model, fields in UPLOAD_FIELDS.items() for field in fields
+    )
+
+
+def referenced_names():
+    names = set()
+    for model, fields in UPLOAD_FIELDS.items():
+        for field in fields:
+            names.update(model._default_manager.exclude(**{f'{field}__isnull': True})
+                         .exclude(**{field: ''}).values_list(field, flat=True))
+    return names
+
+
+def release_file(name):
+    """
+    Deletes the stored file `name` and its image derivatives if no row
+    references it any more. Returns True if the file was deleted.
+    """
+    if not name or count_references(name):
+        return False
+    content_storage.delete(name)
+    delete_derivatives(name)
+    return True
+
+
+def _walk(storage, directory):
+    try:
+        directories, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f'{directory}/{name}'
+    for subdirectory in directories:
+        yield from _walk(storage, f'{directory}/{subdirectory}')
+
+
+def collect_garbage(min_age=timedelta(hours=24), dry_run=False):
+    """
+    Deletes blobs, files left in the old `upload_to` directories and image
+    derivatives that no row references. Files younger than `min_age` are
+    kept, as the row that will reference them may not be committed yet.
+    Returns the (would-be) deleted names.
+    """
+    referenced = referenced_names()
+    referenced_roots = {posixpath.splitext(name)[0] for name in referenced}
+    directories = {ContentHashedStorage.BLOB_DIR} | {
+        model._meta.get_field(field).upload_to.strip('/')
+        for model, fields in UPLOAD_FIELDS.items() for field in fields
+    }
+
+    orphans = [
+        name for directory in sorted(directories)
+        for name in _walk(content_storage, directory) if name not in referenced
+    ]
+    for name in _walk(content_storage, DERIVATIVE_DIR):
+        match = DERIVATIVE_NAME.match(name)
+        if not match or match['root'] not in referenced_roots:
+            orphans.append(name)
+
+    cutoff = timezone.now() - min_age
+    deleted = []
+    for name in orphans:
+        if content_storage.get_modified_time(name) > cutoff:
+            continue
+        if not dry_run:
+            content_storage.delete(name)
+            cache.delete(derivative_manifest_key(name))
+        deleted.append(name)
+    return deleted
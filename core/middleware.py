@@ -0,0 +1,77 @@
+# imad/core/middleware.py
+
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .profiling import RequestProfile, current_profile, instrument_templates, profile_store
+
+
+# ==============================================================================
+#  REQUEST PROFILING (opt-in, see REQUEST_PROFILING_SAMPLE_RATE in settings.py)
+# ==============================================================================
+
+class RequestProfilingMiddleware:
+    """
+    Profiles a random sample of requests to `core.views`: wall time, query
+    count and time, template render time and response size. Results are sent
+    back as a `Server-Timing` header and aggregated into `profile_store`,
+    which the dashboard's Performance partial reads.
+
+    Both sync and async capable, so under ASGI the async views aren't pushed
+    through a thread just to be profiled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        instrument_templates()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self._record(request, response, profile, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self._record(request, response, profile, time.perf_counter() - start)
+
+    def _record(self, request, response, profile, wall_seconds):
+        match = request.resolver_match
+        if match is None or match.func.__module__ != 'core.views':
+            return response
+
+        size = 0 if response.streaming else len(response.content)
+        profile_store.record(match.view_name, profile, wall_seconds, size)
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={wall_seconds * 1000:.1f}',
+            f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.queries} queries"',
+            f'tpl;dur={profile.template_seconds * 1000:.1f}',
+        ])
+        return response
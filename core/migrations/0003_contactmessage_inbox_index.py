@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_contactmessage'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='contactmessage',
+            options={'ordering': ['-sent_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-sent_at', '-id'], name='contactmessage_inbox_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:03
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+SQLITE_FTS5 = [
+    "CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5("
+    "title, body, content='core_searchdocument', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER core_searchdocument_ai AFTER INSERT ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER core_searchdocument_ad AFTER DELETE ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER core_searchdocument_au AFTER UPDATE ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_FTS5_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_searchdocument_au",
+    "DROP TRIGGER IF EXISTS core_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS core_searchdocument_ai",
+    "DROP TABLE IF EXISTS core_searchdocument_fts",
+]
+POSTGRES_GIN = [
+    "CREATE INDEX searchdocument_vector_gin ON core_searchdocument USING GIN (search_vector)",
+]
+POSTGRES_GIN_REVERSE = [
+    "DROP INDEX IF EXISTS searchdocument_vector_gin",
+]
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Creates the backend-specific full-text index and fills the search table."""
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FTS5, 'postgresql': POSTGRES_GIN}.get(vendor, []):
+        schema_editor.execute(sql)
+
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    sources = {
+        'project': (apps.get_model('core', 'Project'), lambda p: (p.title, p.description)),
+        'experience': (apps.get_model('core', 'Experience'), lambda e: (e.title, f"{e.company}\n{e.description}")),
+        'message': (apps.get_model('core', 'ContactMessage'), lambda m: (m.name, f"{m.email}\n{m.message}")),
+    }
+    for kind, (model, get_text) in sources.items():
+        SearchDocument.objects.bulk_create(
+            (SearchDocument(kind=kind, object_id=obj.pk, title=get_text(obj)[0][:300], body=get_text(obj)[1])
+             for obj in model.objects.iterator()),
+            batch_size=1000,
+        )
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE core_searchdocument SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FTS5_REVERSE, 'postgresql': POSTGRES_GIN_REVERSE}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_contactmessage_inbox_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('experience', 'Experience'), ('message', 'Contact Message')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='searchdocument_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:23
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='cv',
+            field=models.FileField(blank=True, help_text='Upload your CV/Resume.', null=True, storage=core.storage.get_content_storage, upload_to='cv/'),
+        ),
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='profile_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.get_content_storage, upload_to='profile_images/'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(storage=core.storage.get_content_storage, upload_to='project_images/'),
+        ),
+    ]
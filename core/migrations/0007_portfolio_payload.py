@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:35
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_content_hashed_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:40
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+# The admin list (load_admins, create_admin) filters auth_user on is_staff.
+# auth.User belongs to another app, so its partial index is created here by
+# hand, through the schema editor so the condition matches the ORM's SQL.
+USER_STAFF_INDEX = models.Index(fields=['id'], name='user_staff_idx', condition=Q(is_staff=True))
+
+
+def add_user_staff_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('auth', 'User'), USER_STAFF_INDEX)
+
+
+def remove_user_staff_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('auth', 'User'), USER_STAFF_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0007_portfolio_payload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['-start_date'], name='experience_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['display_order'], name='project_display_order_idx'),
+        ),
+        migrations.RunPython(add_user_staff_index, remove_user_staff_index),
+    ]
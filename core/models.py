@@ -1,17 +1,23 @@
 # imad/core/models.py
 
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
+
+from .storage import get_content_storage
 
 # Model for your main personal information
 class PersonalInfo(models.Model):
     name = models.CharField(max_length=100, default="Your Name")
     title = models.CharField(max_length=100, help_text="e.g., Full-Stack Developer")
     bio = models.TextField(blank=True, help_text="A short biography about yourself.")
-    profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
-    cv = models.FileField(upload_to='cv/', blank=True, null=True, help_text="Upload your CV/Resume.")
+    profile_image = models.ImageField(upload_to='profile_images/', storage=get_content_storage, blank=True, null=True)
+    cv = models.FileField(upload_to='cv/', storage=get_content_storage, blank=True, null=True, help_text="Upload your CV/Resume.")
     email = models.EmailField(blank=True)
     github_url = models.URLField(blank=True)
     linkedin_url = models.URLField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Personal Info"
@@ -27,7 +33,8 @@ class PersonalInfo(models.Model):
 # Model for your skills
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True)
-    
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ['name']
 
@@ -38,14 +45,18 @@ class Skill(models.Model):
 class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
-    image = models.ImageField(upload_to='project_images/')
+    image = models.ImageField(upload_to='project_images/', storage=get_content_storage)
     technologies = models.ManyToManyField(Skill, related_name="projects")
     github_link = models.URLField(blank=True)
     live_link = models.URLField(blank=True)
     display_order = models.PositiveIntegerField(default=0, help_text="Projects with lower numbers appear first.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['display_order']
+        indexes = [
+            models.Index(fields=['display_order'], name='project_display_order_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -63,9 +74,15 @@ class Experience(models.Model):
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True, help_text="Leave blank if current.")
     description = models.TextField(help_text="Use bullet points or a short paragraph.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-start_date']
+        # Work and education are split from one ordered read (core/payload.py),
+        # so the ordering is the access path rather than (category, start_date).
+        indexes = [
+            models.Index(fields=['-start_date'], name='experience_start_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -75,10 +92,50 @@ class ContactMessage(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()
     message = models.TextField()
-    sent_at = models.DateTimeField(auto_now_add=True)
+    # Set when the form is submitted, not when core/ingest.py gets round to writing it.
+    sent_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # `id` breaks ties between messages sent in the same instant, so the
+        # inbox can be paged with a (sent_at, id) cursor.
+        ordering = ['-sent_at', '-id']
+        indexes = [
+            models.Index(fields=['-sent_at', '-id'], name='contactmessage_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"Message from {self.name} ({self.email})"
+
+# Denormalised full-text search index over projects, experiences and messages.
+# Rows are kept current by core/signals.py; see core/search.py for the queries.
+class SearchDocument(models.Model):
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('experience', 'Experience'),
+        ('message', 'Contact Message'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    # PostgreSQL only (GIN indexed); SQLite searches the FTS5 shadow table instead.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
-        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='searchdocument_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+# Denormalised copy of everything the homepage shows, as one JSON document.
+# Rebuilt by core/payload.py whenever portfolio content changes, so pages are
+# assembled from a single primary-key lookup instead of five queries.
+class PortfolioPayload(models.Model):
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Message from {self.name} ({self.email})"
\ No newline at end of file
+        return f"Portfolio payload ({self.updated_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,112 @@
+# imad/core/payload.py
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+
+from .models import PersonalInfo, Skill, Project, Experience, PortfolioPayload
+
+
+# ==============================================================================
+#  DENORMALISED HOMEPAGE PAYLOAD
+# ==============================================================================
+
+# The homepage (and the dashboard partials listing the same content) read one
+# PortfolioPayload row instead of joining PersonalInfo, Skill, Project,
+# its technologies and Experience. The row is rebuilt after every change to
+# those models (see core/signals.py and core/bulk.py).
+PAYLOAD_PK = 1
+
+
+def _row(instance):
+    """The instance's concrete field values, as stored in the payload."""
+    row = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        row[field.attname] = value.name if isinstance(value, FieldFile) else value
+    return row
+
+
+def _instance(model, row):
+    """An (unsaved) `model` instance rebuilt from a payload row; templates can't tell."""
+    return model(**{
+        field.attname: field.to_python(row.get(field.attname))
+        for field in model._meta.concrete_fields
+    })
+
+
+def build_payload():
+    """Reads the current portfolio content into a JSON-serialisable dict (five queries)."""
+    technologies = {}
+    for project_id, skill_id in Project.technologies.through.objects.values_list('project_id', 'skill_id'):
+        technologies.setdefault(project_id, []).append(skill_id)
+    info = PersonalInfo.objects.first()
+    return {
+        'info': _row(info) if info else None,
+        'skills': [_row(skill) for skill in Skill.objects.all()],
+        'projects': [
+            {**_row(project), 'technologies': technologies.get(project.pk, [])}
+            for project in Project.objects.all()
+        ],
+        'experiences': [_row(experience) for experience in Experience.objects.all()],
+    }
+
+
+def rebuild_payload():
+    """
+    Rebuilds the payload from the database. The row is locked first, so
+    concurrent rebuilds run one after the other and the last one to write
+    has read the newest content. Returns the new payload.
+    """
+    with transaction.atomic():
+        list(PortfolioPayload.objects.select_for_update().filter(pk=PAYLOAD_PK))
+        data = build_payload()
+        PortfolioPayload.objects.update_or_create(pk=PAYLOAD_PK, defaults={'data': data})
+    return data
+
+
+def hydrate(data):
+    """
+    Turns a payload back into the homepage context: model instances in
+    their usual ordering, with each project's skills in `technology_list`.
+    """
+    skills = [_instance(Skill, row) for row in data['skills']]
+    skills_by_pk = {skill.pk: skill for skill in skills}
+    projects = []
+    for row in data['projects']:
+        project = _instance(Project, row)
+        project.technology_list = [skills_by_pk[pk] for pk in row['technologies'] if pk in skills_by_pk]
+        projects.append(project)
+    experiences = [_instance(Experience, row) for row in data['experiences']]
+    return {
+        'info': _instance(PersonalInfo, data['info']) if data['info'] else None,
+        'skills': skills,
+        'projects': projects,
+        'work_experiences': [e for e in experiences if e.category == 'work'],
+        'education_experiences': [e for e in experiences if e.category == 'education'],
+    }
+
+
+def get_payload():
+    """The stored payload (a JSON-decoded dict), with one primary-key lookup."""
+    data = PortfolioPayload.objects.filter(pk=PAYLOAD_PK).values_list('data', flat=True).first()
+    return data if data is not None else rebuild_payload()
+
+
+async def aget_payload():
+    """get_payload() for async views."""
+    data = await PortfolioPayload.objects.filter(pk=PAYLOAD_PK).values_list('data', flat=True).afirst()
+    if data is None:
+        # Only before the first rebuild (e.g. right after migrating).
+        data = await sync_to_async(rebuild_payload)()
+    return data
+
+
+def get_portfolio():
+    """The hydrated portfolio content."""
+    return hydrate(get_payload())
+
+
+async def aget_portfolio():
+    """get_portfolio() for async views."""
+    return hydrate(await aget_payload())
@@ -0,0 +1,165 @@
+# imad/core/profiling.py
+
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+
+from django.template.backends import django as django_backend
+
+
+# ==============================================================================
+#  PER-REQUEST MEASUREMENTS
+# ==============================================================================
+
+class RequestProfile:
+    """Timings collected for one profiled request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self._template_depth = 0
+
+
+# The profile of the request being handled in this thread/task, if any.
+current_profile = contextvars.ContextVar('current_profile', default=None)
+
+
+def _profiled_template_render(render):
+    def wrapper(self, context=None, request=None):
+        profile = current_profile.get()
+        if profile is None:
+            return render(self, context, request)
+        # Only time the outermost render; nested ones are already included.
+        profile._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            profile._template_depth -= 1
+            if profile._template_depth == 0:
+                profile.template_seconds += time.perf_counter() - start
+    wrapper.profiled = True
+    return wrapper
+
+
+def instrument_templates():
+    """Times Django template renders for profiled requests. Idempotent."""
+    render = django_backend.Template.render
+    if not getattr(render, 'profiled', False):
+        django_backend.Template.render = _profiled_template_render(render)
+
+
+def profile_query(execute, sql, params, many, context):
+    """
+    Times a query for the profiled request, if any. core/signals.py adds it
+    to every connection's `execute_wrappers` as the connection is made, so it
+    also sees the queries an async view runs on a sync_to_async thread's
+    connection.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_seconds += time.perf_counter() - start
+
+
+# ==============================================================================
+#  ROLLING PER-ENDPOINT HISTOGRAMS
+# ==============================================================================
+
+# Upper bounds (ms) of the wall-time histogram buckets; the last bucket is open.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class EndpointStats:
+    """
+    Wall-time histogram and averaged counters for one endpoint, kept as a ring
+    of fixed time windows so old traffic rolls off after
+    `window_seconds * windows` seconds.
+    """
+
+    def __init__(self, window_seconds=60, windows=15):
+        self.window_seconds = window_seconds
+        self._windows = deque(maxlen=windows)
+
+    def _window(self, now):
+        start = int(now // self.window_seconds) * self.window_seconds
+        if not self._windows or self._windows[-1]['start'] != start:
+            self._windows.append({
+                'start': start, 'buckets': [0] * (len(BUCKETS_MS) + 1), 'count': 0,
+                'wall_ms': 0.0, 'db_ms': 0.0, 'queries': 0, 'template_ms': 0.0, 'bytes': 0,
+            })
+        return self._windows[-1]
+
+    def add(self, wall_ms, db_ms, queries, template_ms, size, now=None):
+        window = self._window(time.time() if now is None else now)
+        window['buckets'][bisect.bisect_left(BUCKETS_MS, wall_ms)] += 1
+        window['count'] += 1
+        window['wall_ms'] += wall_ms
+        window['db_ms'] += db_ms
+        window['queries'] += queries
+        window['template_ms'] += template_ms
+        window['bytes'] += size
+
+    def summary(self, now=None):
+        """Aggregates the live windows; percentiles are bucket upper bounds."""
+        now = time.time() if now is None else now
+        oldest = now - self.window_seconds * self._windows.maxlen
+        windows = [w for w in self._windows if w['start'] > oldest]
+        count = sum(w['count'] for w in windows)
+        if not count:
+            return None
+        buckets = [sum(column) for column in zip(*(w['buckets'] for w in windows))]
+
+        def percentile(pct):
+            threshold, seen = pct / 100 * count, 0
+            for bound, bucket_count in zip(BUCKETS_MS + (None,), buckets):
+                seen += bucket_count
+                if seen >= threshold:
+                    return bound
+            return None
+
+        def average(key):
+            return sum(w[key] for w in windows) / count
+
+        return {
+            'count': count,
+            'p50_ms': percentile(50), 'p95_ms': percentile(95), 'p99_ms': percentile(99),
+            'avg_wall_ms': average('wall_ms'), 'avg_db_ms': average('db_ms'),
+            'avg_queries': average('queries'), 'avg_template_ms': average('template_ms'),
+            'avg_bytes': average('bytes'),
+            'histogram': list(zip(BUCKETS_MS + (None,), buckets)),
+        }
+
+
+class ProfileStore:
+    """Per-process registry of EndpointStats, keyed by URL name."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, profile, wall_seconds, size):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, EndpointStats())
+            stats.add(wall_seconds * 1000, profile.db_seconds * 1000, profile.queries,
+                      profile.template_seconds * 1000, size)
+
+    def summaries(self):
+        with self._lock:
+            rows = [(endpoint, stats.summary()) for endpoint, stats in self._endpoints.items()]
+        return sorted(((e, s) for e, s in rows if s), key=lambda row: -row[1]['avg_wall_ms'])
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,150 @@
+# imad/core/search.py
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from .models import Project, Experience, ContactMessage, SearchDocument
+
+
+# ==============================================================================
+#  WHAT GETS INDEXED
+# ==============================================================================
+
+# kind -> (model, function returning the (title, body) text to index)
+SEARCHABLE = {
+    'project': (Project, lambda p: (p.title, p.description)),
+    'experience': (Experience, lambda e: (e.title, f"{e.company}\n{e.description}")),
+    'message': (ContactMessage, lambda m: (m.name, f"{m.email}\n{m.message}")),
+}
+KIND_BY_MODEL = {model: kind for kind, (model, _) in SEARCHABLE.items()}
+
+# Title matches rank above body matches.
+POSTGRES_SEARCH_VECTOR = (
+    SearchVector('title', weight='A', config='english') +
+    SearchVector('body', weight='B', config='english')
+)
+SQLITE_FTS_TABLE = 'core_searchdocument_fts'
+
+
+# ==============================================================================
+#  INCREMENTAL INDEX MAINTENANCE (called from core/signals.py and core/ingest.py)
+# ==============================================================================
+
+def index_objects(objects):
+    """Adds or refreshes the search documents for `objects` (all of one model)."""
+    objects = list(objects)
+    if not objects:
+        return
+    kind = KIND_BY_MODEL[type(objects[0])]
+    get_text = SEARCHABLE[kind][1]
+    documents = []
+    for obj in objects:
+        title, body = get_text(obj)
+        documents.append(SearchDocument(kind=kind, object_id=obj.pk, title=title[:300], body=body))
+
+    with transaction.atomic():
+        # On SQLite, triggers on core_searchdocument keep the FTS5 table in step.
+        SearchDocument.objects.bulk_create(
+            documents, update_conflicts=True,
+            unique_fields=['kind', 'object_id'], update_fields=['title', 'body'],
+        )
+        if connection.vendor == 'postgresql':
+            SearchDocument.objects.filter(
+                kind=kind, object_id__in=[obj.pk for obj in objects]
+            ).update(search_vector=POSTGRES_SEARCH_VECTOR)
+
+
+def remove_objects(objects):
+    """Deletes the search documents for `objects` (all of one model)."""
+    objects = list(objects)
+    if objects:
+        remove_ids(type(objects[0]), [obj.pk for obj in objects])
+
+
+def remove_ids(model, ids):
+    """Deletes the search documents for the `model` rows with these primary keys."""
+    SearchDocument.objects.filter(kind=KIND_BY_MODEL[model], object_id__in=ids).delete()
+
+
+def rebuild_index(chunk_size=2000):
+    """Re-indexes every searchable row from scratch."""
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for model, _ in SEARCHABLE.values():
+            batch = []
+            for obj in model.objects.order_by('pk').iterator(chunk_size=chunk_size):
+                batch.append(obj)
+                if len(batch) == chunk_size:
+                    index_objects(batch)
+                    batch = []
+            index_objects(batch)
+
+
+# ==============================================================================
+#  QUERYING
+# ==============================================================================
+
+def search(query, limit=20):
+    """
+    Returns up to `limit` {'kind', 'object'} results for `query`, best first.
+    Uses the GIN-indexed tsvector on PostgreSQL and FTS5 on SQLite.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        hits = _search_postgres(query, limit)
+    elif connection.vendor == 'sqlite':
+        hits = _search_sqlite(query, limit)
+    else:
+        hits = _search_fallback(query, limit)
+    return _load_results(hits)
+
+
+def _search_postgres(query, limit):
+    search_query = SearchQuery(query, search_type='websearch', config='english')
+    return list(
+        SearchDocument.objects
+        .filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-rank')
+        .values_list('kind', 'object_id')[:limit]
+    )
+
+
+def _search_sqlite(query, limit):
+    # Quote every word so user input can't inject FTS5 syntax; `*` makes each a prefix match.
+    terms = ['"{}"*'.format(word.replace('"', '""')) for word in query.split()]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT d.kind, d.object_id FROM {SQLITE_FTS_TABLE} f '
+            f'JOIN core_searchdocument d ON d.id = f.rowid '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({SQLITE_FTS_TABLE}, 10.0, 1.0) LIMIT %s',
+            [' '.join(terms), limit],
+        )
+        return cursor.fetchall()
+
+
+def _search_fallback(query, limit):
+    return list(
+        SearchDocument.objects
+        .filter(Q(title__icontains=query) | Q(body__icontains=query))
+        .values_list('kind', 'object_id')[:limit]
+    )
+
+
+def _load_results(hits):
+    """Fetches the matched objects with one query per kind, keeping the ranking order."""
+    ids_by_kind = {}
+    for kind, object_id in hits:
+        ids_by_kind.setdefault(kind, []).append(object_id)
+    objects = {
+        kind: SEARCHABLE[kind][0].objects.in_bulk(ids)
+        for kind, ids in ids_by_kind.items()
+    }
+    return [
+        {'kind': kind, 'object': objects[kind][object_id]}
+        for kind, object_id in hits if object_id in objects[kind]
+    ]
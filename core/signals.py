@@ -0,0 +1,179 @@
+# imad/core/signals.py
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .bulk import bulk_operation
+from .cache import bump_model_version, bump_portfolio_version
+from .events import message_hub
+from .images import get_derivatives, schedule_derivatives
+from .media import UPLOAD_FIELDS, release_file
+from .payload import rebuild_payload
+from .profiling import profile_query
+from .search import index_objects, remove_objects
+from .snapshot import schedule_snapshot
+from .models import PersonalInfo, Skill, Project, Experience, ContactMessage
+
+
+# ==============================================================================
+#  PORTFOLIO CONTENT INVALIDATION
+# ==============================================================================
+
+def _portfolio_changed():
+    # Bumping before commit would let a concurrent request cache the old rows
+    # under the new version; likewise the payload is rebuilt before the bump.
+    rebuild_payload()
+    bump_portfolio_version()
+    schedule_snapshot()
+
+
+@receiver(post_save, sender=PersonalInfo)
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=PersonalInfo)
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Experience)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def portfolio_content_changed(sender, **kwargs):
+    """Rebuilds the homepage payload and bumps the portfolio version once the change is committed."""
+    # m2m_changed fires for pre_* and post_* actions; one bump is enough.
+    action = kwargs.get('action')
+    if bulk_operation.get() or action is not None and not action.startswith('post_'):
+        return
+    # A form save sends post_save and several m2m_changed in one transaction,
+    # so the work is queued once: the connection remembers the pending
+    # callback until it runs. One dropped by a rollback doesn't count.
+    pending = getattr(connection, 'portfolio_change_pending', None)
+    if pending and any(callback is pending for _, callback, _ in connection.run_on_commit):
+        return
+
+    def changed():
+        connection.portfolio_change_pending = None
+        _portfolio_changed()
+    connection.portfolio_change_pending = changed
+    transaction.on_commit(changed)
+
+
+@receiver(post_save, sender=PersonalInfo)
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Experience)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=PersonalInfo)
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Experience)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def model_content_changed(sender, **kwargs):
+    """Changes the ETag of the dashboard partials that list this model."""
+    action = kwargs.get('action')
+    if bulk_operation.get() or action is not None and not action.startswith('post_'):
+        return
+    model = Project if sender is Project.technologies.through else sender
+    transaction.on_commit(lambda: bump_model_version(model))
+
+
+# ==============================================================================
+#  REAL-TIME DASHBOARD NOTIFICATIONS
+# ==============================================================================
+
+@receiver(post_save, sender=ContactMessage)
+def contact_message_saved(sender, instance, created, **kwargs):
+    """Pushes the same events `check_new_messages` sends to connected dashboards."""
+    if created and not bulk_operation.get():
+        transaction.on_commit(lambda: message_hub.publish('newMessage', 'messages-changed'))
+
+
+# ==============================================================================
+#  RESPONSIVE IMAGE DERIVATIVES
+# ==============================================================================
+
+IMAGE_FIELDS = {
+    Project: ['image'],
+    PersonalInfo: ['profile_image'],
+}
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=PersonalInfo)
+def image_saved(sender, instance, **kwargs):
+    """Builds srcset derivatives for any image that doesn't have them yet."""
+    for field_name in IMAGE_FIELDS[sender]:
+        name = getattr(instance, field_name).name
+        if name and get_derivatives(name) is None:
+            schedule_derivatives(name)
+
+
+# ==============================================================================
+#  UPLOADED FILE CLEANUP
+# ==============================================================================
+
+def _stored_name(instance, field_name):
+    # Read the raw attribute so deferred fields aren't loaded just for this.
+    value = instance.__dict__.get(field_name)
+    return getattr(value, 'name', value) or ''
+
+def _release_on_commit(name):
+    # The blob may be shared with other rows; release_file checks that.
+    transaction.on_commit(lambda: release_file(name))
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=PersonalInfo)
+def remember_uploads(sender, instance, **kwargs):
+    """Notes the stored file names so a later save can tell which ones it replaced."""
+    instance._stored_uploads = {
+        field_name: _stored_name(instance, field_name)
+        for field_name in UPLOAD_FIELDS[sender] if field_name in instance.__dict__
+    }
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=PersonalInfo)
+def uploads_saved(sender, instance, **kwargs):
+    for field_name, old_name in instance._stored_uploads.items():
+        if old_name and old_name != _stored_name(instance, field_name):
+            _release_on_commit(old_name)
+    remember_uploads(sender, instance)
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=PersonalInfo)
+def uploads_deleted(sender, instance, **kwargs):
+    for field_name in UPLOAD_FIELDS[sender]:
+        name = _stored_name(instance, field_name)
+        if name:
+            _release_on_commit(name)
+
+
+# ==============================================================================
+#  FULL-TEXT SEARCH INDEX
+# ==============================================================================
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Experience)
+@receiver(post_save, sender=ContactMessage)
+def searchable_saved(sender, instance, **kwargs):
+    if not bulk_operation.get():
+        index_objects([instance])
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Experience)
+@receiver(post_delete, sender=ContactMessage)
+def searchable_deleted(sender, instance, **kwargs):
+    if not bulk_operation.get():
+        remove_objects([instance])
+
+
+# ==============================================================================
+#  REQUEST PROFILING
+# ==============================================================================
+
+@receiver(connection_created)
+def connection_made(sender, connection, **kwargs):
+    """Lets RequestProfilingMiddleware count this connection's queries (a no-op otherwise)."""
+    # First in the list, so `connection.execute_wrapper()` blocks still pop their own.
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, profile_query)
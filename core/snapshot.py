@@ -0,0 +1,102 @@
+# imad/core/snapshot.py
+
+import gzip
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from .cache import CSRF_TOKEN_HOLE, HOLE_PATTERN, get_cached_page, get_portfolio_version
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+#  STATIC SNAPSHOT OF THE PUBLIC HOMEPAGE (see PORTFOLIO_SNAPSHOT in settings.py)
+# ==============================================================================
+
+# The portfolio version the snapshot on disk was rendered from.
+SNAPSHOT_VERSION_KEY = 'portfolio:snapshot-version'
+
+# Rebuilds run one at a time, off the request thread.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='portfolio-snapshot')
+_pending = threading.Event()
+
+
+def snapshot_path():
+    return os.path.join(settings.PORTFOLIO_SNAPSHOT_ROOT, 'index.html')
+
+
+def render_snapshot():
+    """
+    Renders the homepage as a visitor without a session sees it. The CSRF
+    token is left empty; a script in index.html fetches one (and any flash
+    messages) from `contact_form_state` when the snapshot is served.
+    """
+    # Imported here because core.views imports the modules that schedule snapshots.
+    from .views import get_home_context
+
+    content = get_cached_page('home', 'core/index.html', get_home_context)
+    content = content.replace(CSRF_TOKEN_HOLE, '')
+    return HOLE_PATTERN.sub(lambda match: render_to_string(match.group(1)), content)
+
+
+def build_snapshot(force=False):
+    """
+    Writes index.html (and index.html.gz) under PORTFOLIO_SNAPSHOT_ROOT if the
+    portfolio changed since the last snapshot. Returns True if it was written.
+    """
+    version = get_portfolio_version()
+    path = snapshot_path()
+    if not force and cache.get(SNAPSHOT_VERSION_KEY) == version and os.path.exists(path):
+        return False
+
+    content = render_snapshot().encode()
+    # The version only lives in the cache, which may be per process; an
+    # unchanged page is never rewritten either way.
+    if not force and _read(path) == content:
+        cache.set(SNAPSHOT_VERSION_KEY, version, None)
+        return False
+
+    os.makedirs(settings.PORTFOLIO_SNAPSHOT_ROOT, exist_ok=True)
+    # Replace the files atomically so a proxy never serves a half-written page.
+    for target, data in ((path, content), (path + '.gz', gzip.compress(content, mtime=0))):
+        fd, temp_path = tempfile.mkstemp(dir=settings.PORTFOLIO_SNAPSHOT_ROOT, prefix='.snapshot-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, target)
+    cache.set(SNAPSHOT_VERSION_KEY, version, None)
+    return True
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _build_in_background():
+    # Changes arriving while this build runs queue another one.
+    _pending.clear()
+    try:
+        build_snapshot()
+    except Exception:
+        logger.exception("Could not build the homepage snapshot.")
+
+
+def schedule_snapshot():
+    """
+    Rebuilds the snapshot in the background when PORTFOLIO_SNAPSHOT is on.
+    Call it after the change has been committed.
+    """
+    if settings.PORTFOLIO_SNAPSHOT and not _pending.is_set():
+        _pending.set()
+        _executor.submit(_build_in_background)
@@ -0,0 +1,138 @@
+# imad/core/spam.py
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core import signing
+
+from .cache import get_counters_many, incr_counter, throttle_cache
+
+
+# ==============================================================================
+#  CONTACT FORM SPAM PRE-FILTER
+# ==============================================================================
+
+# Every check below runs before the message reaches contact_message_queue, so
+# a rejected submission costs a few cache operations and no database write.
+
+# Outcomes counted by `record()`, in the order the dashboard lists them.
+OUTCOMES = {
+    'accepted': "Accepted",
+    'honeypot': "Honeypot filled in",
+    'bad_token': "Missing or expired form token",
+    'too_fast': "Submitted too quickly",
+    'duplicate': "Duplicate message",
+    'ip_rate_limited': "Rate limited (IP)",
+    'email_rate_limited': "Rate limited (email)",
+    'queue_full': "Ingest queue full",
+}
+
+# Bots are told these went through, so they learn nothing from the response.
+SILENT_REJECTIONS = {'honeypot', 'duplicate'}
+
+COUNTER_KEY = 'contact-guard:{}'
+_signer = signing.Signer(salt='core.spam.form-token')
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def client_ip(request):
+    """The client's address, skipping the NUM_PROXIES entries our own proxies appended."""
+    if settings.NUM_PROXIES:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= settings.NUM_PROXIES:
+            return forwarded[-settings.NUM_PROXIES]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+# --- Form timing token ---
+
+def make_form_token(now=None):
+    """A signed timestamp of when the contact form was shown."""
+    return _signer.sign(str(int(time.time() if now is None else now)))
+
+
+def form_token_age(token):
+    """Seconds since `token` was made, or None if it is missing or tampered with."""
+    try:
+        return time.time() - float(_signer.unsign(token or ''))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+# --- Token buckets ---
+
+def bucket_key(scope, identifier):
+    return f'contact-rate:{scope}:{_digest(identifier)}'
+
+
+def take_token(key, burst, per_hour, now=None):
+    """
+    Takes one token from the bucket stored under `key`, which holds `burst`
+    tokens and refills `per_hour` of them an hour. Returns False if it is empty.
+    Concurrent requests may both read the same state; for shedding load a
+    rare extra message is fine, and it keeps this to one get and one set.
+    """
+    now = time.time() if now is None else now
+    refill = per_hour / 3600
+    tokens, updated = throttle_cache.get(key, (burst, now))
+    tokens = min(burst, tokens + (now - updated) * refill)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    # Expire once the bucket would be full again anyway.
+    throttle_cache.set(key, (tokens, now), math.ceil((burst - tokens) / refill) + 1)
+    return allowed
+
+
+# --- Duplicate detection ---
+
+def fingerprint(cleaned_data):
+    """The same sender and message, ignoring case and whitespace."""
+    message = ' '.join(cleaned_data['message'].lower().split())
+    return f"contact-fingerprint:{_digest(cleaned_data['email'].lower() + chr(0) + message)}"
+
+
+def remember_submission(cleaned_data):
+    """Marks a stored message so resubmitting it is dropped as a duplicate."""
+    throttle_cache.set(fingerprint(cleaned_data), True, settings.CONTACT_DUPLICATE_WINDOW)
+
+
+# --- Screening ---
+
+def screen_submission(request, cleaned_data):
+    """
+    Returns None if a valid ContactForm submission may be stored, or the
+    OUTCOMES key of the first check it fails. The cheapest checks run first.
+    """
+    if cleaned_data.get('website'):
+        return 'honeypot'
+    age = form_token_age(cleaned_data.get('form_token'))
+    if age is None or age > settings.CONTACT_FORM_MAX_SECONDS:
+        return 'bad_token'
+    if age < settings.CONTACT_FORM_MIN_SECONDS:
+        return 'too_fast'
+    if throttle_cache.get(fingerprint(cleaned_data)):
+        return 'duplicate'
+    if not take_token(bucket_key('ip', client_ip(request)), *settings.CONTACT_RATE_LIMIT_IP):
+        return 'ip_rate_limited'
+    if not take_token(bucket_key('email', cleaned_data['email'].lower()), *settings.CONTACT_RATE_LIMIT_EMAIL):
+        return 'email_rate_limited'
+    return None
+
+
+# --- Counters ---
+
+def record(outcome):
+    """Counts a submission's outcome (shared by every process using the cache)."""
+    incr_counter(COUNTER_KEY.format(outcome))
+
+
+def get_counters():
+    """Returns [(label, count), ...] for every outcome, in OUTCOMES order."""
+    counts = get_counters_many([COUNTER_KEY.format(outcome) for outcome in OUTCOMES])
+    return [(label, counts.get(COUNTER_KEY.format(outcome), 0)) for outcome, label in OUTCOMES.items()]
@@ -0,0 +1,76 @@
+# imad/core/storage.py
+
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+
+# ==============================================================================
+#  CONTENT-HASHED UPLOADS
+# ==============================================================================
+
+class ContentHashedStorage(FileSystemStorage):
+    """
+    Stores every upload as `blobs/<aa>/<sha256>.<ext>`, whatever its field's
+    `upload_to`, so identical files uploaded anywhere share one blob and a
+    name never changes content (which makes it safe to cache for good).
+    Blobs are shared between rows, so they are only deleted once nothing
+    references them; see core/media.py.
+    """
+
+    BLOB_DIR = 'blobs'
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            from django.core.files import File
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        extension = posixpath.splitext(name)[1].lower()
+        hex_digest = digest.hexdigest()
+        blob_name = f'{self.BLOB_DIR}/{hex_digest[:2]}/{hex_digest}{extension}'
+        if not self.exists(blob_name):
+            self._write_blob(blob_name, content)
+        return blob_name
+
+    def _write_blob(self, blob_name, content):
+        """
+        Writes `content` to a temporary file next to the blob and renames it
+        into place, so a blob is never seen half-written. Two uploads of the
+        same content may both get here; the second rename just replaces the
+        blob with identical bytes.
+        """
+        path = self.path(blob_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temporary file left by a crash is unreferenced, so gc_media removes it.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    temp_file.write(chunk)
+            os.chmod(temp_path, 0o644 if self.file_permissions_mode is None else self.file_permissions_mode)
+            # Names are content-addressed, so replacing an existing blob is harmless.
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get_available_name(self, name, max_length=None):
+        # The same name always means the same content, so never add a suffix.
+        return name
+
+
+content_storage = ContentHashedStorage()
+
+def get_content_storage():
+    """Storage for uploaded files (referenced by callable so migrations stay stable)."""
+    return content_storage
@@ -0,0 +1,33 @@
+// imad/core/tailwind/tailwind.config.js
+//
+// Compiled by `python manage.py build_css` into core/static/core/css/portfolio.css.
+// Only classes that appear in these files end up in the stylesheet, so a class
+// built from pieces at runtime (e.g. 'bg-' + color) must be spelled out somewhere.
+
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: {
+    relative: true,
+    files: [
+      '../../templates/**/*.html',
+      '../templates/**/*.html',
+      // Widget `attrs` classes.
+      '../forms.py',
+      '../templatetags/*.py',
+    ],
+  },
+  theme: {
+    extend: {
+      // Custom "Apex" color theme
+      colors: {
+        'apex-dark': '#1E1E2D',
+        'apex-card': '#2A2A3A',
+        'apex-accent': '#FF6B6B',
+        'apex-purple': '#6C63FF',
+        'apex-white': '#F3F4F6',
+        'apex-gray': '#9E9E9E',
+      },
+    },
+  },
+  plugins: [],
+}
@@ -0,0 +1,51 @@
+# imad/core/templatetags/portfolio_tags.py
+
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..cache import HOLE_MARKER
+from ..images import get_derivatives, schedule_derivatives
+from ..spam import make_form_token
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, template_name):
+    """
+    Includes a per-visitor partial. When the page is being rendered for the
+    page cache, a marker is emitted instead and the partial is rendered for
+    each request by `core.cache.fill_holes`.
+    """
+    if context.get('punch_holes'):
+        return mark_safe(HOLE_MARKER.format(template_name))
+    return context.template.engine.get_template(template_name).render(context)
+
+
+@register.simple_tag
+def contact_form_token():
+    """A fresh signed timestamp for the contact form's timing check (core/spam.py)."""
+    return make_form_token()
+
+
+@register.inclusion_tag('core/partials/responsive_image.html')
+def responsive_image(image, alt='', css_class='', sizes='100vw', loading='lazy'):
+    """
+    Renders `image` (an ImageField file) as a <picture> with AVIF/WebP srcsets.
+    The derivative manifest comes from the cache; if it is missing, the plain
+    original is rendered and the derivatives are (re)built in the background.
+    """
+    derivatives = get_derivatives(image.name)
+    if derivatives is None:
+        schedule_derivatives(image.name)
+    sources = [
+        {
+            'type': f'image/{fmt}',
+            'srcset': ', '.join(f'{url} {width}w' for url, width in variants),
+        }
+        for fmt, variants in (derivatives or {}).items() if variants
+    ]
+    return {
+        'image': image, 'alt': alt, 'css_class': css_class, 'sizes': sizes,
+        'loading': loading, 'sources': sources,
+    }
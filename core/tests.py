@@ -1,3 +1,1313 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image as PILImage
+
+from .checks import check_stylesheet
+from .benchmark import (
+    Route, compare_results, measure_connection_overhead, measure_login_attack, measure_session_queries, measure_startup,
+    measure_throughput, percentile, run_route, seed_dataset, uncovered_url_names,
+)
+from .events import message_hub
+from .forms import ProjectForm
+from .profiling import EndpointStats, profile_store
+from .media import CONTENT_HASHED_NAME
+from .middleware import RequestProfilingMiddleware
+from .images import _executor as image_executor, build_derivatives, derivative_name, get_derivatives, schedule_derivatives
+from .ingest import ContactMessageQueue
+from .search import search
+from .cache import bump_portfolio_version, get_counter, get_portfolio_version, incr_counter, throttle_cache
+from .payload import get_portfolio, rebuild_payload
+from .snapshot import build_snapshot, snapshot_path
+from .storage import content_storage
+from .spam import get_counters, make_form_token, record, take_token
+from .throttle import lockout_seconds
+from .warmup import warm_up
+from .models import PersonalInfo, Skill, Project, Experience, ContactMessage
+from .views import MESSAGES_PAGE_SIZE, make_message_cursor
+
+
+def png_bytes(size=(8, 8)):
+    buffer = io.BytesIO()
+    PILImage.new('RGB', size, 'purple').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def without_derivative_builds():
+    """Keeps saves and renders from queueing real image derivative builds in the background."""
+    stack = ExitStack()
+    stack.enter_context(patch('core.signals.schedule_derivatives'))
+    stack.enter_context(patch('core.templatetags.portfolio_tags.schedule_derivatives'))
+    return stack
+
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttle_cache.clear()
+
+    def test_second_get_is_served_without_queries(self):
+        self.client.get(reverse('core:home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('core:home'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_content_change_invalidates_cached_page(self):
+        self.client.get(reverse('core:home'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Django')
+        self.assertContains(self.client.get(reverse('core:home')), 'Django')
+
+    def test_csrf_token_is_rendered_per_request(self):
+        first = Client(enforce_csrf_checks=True).get(reverse('core:home'))
+        second = Client(enforce_csrf_checks=True).get(reverse('core:home'))
+        self.assertNotContains(first, '__portfolio_csrf_token__')
+        self.assertNotEqual(first.cookies['csrftoken'].value, second.cookies['csrftoken'].value)
+
+    @override_settings(CONTACT_FORM_MIN_SECONDS=0)
+    def test_contact_post_with_cached_page(self):
+        client = Client(enforce_csrf_checks=True)
+        page = client.get(reverse('core:home')).content.decode()
+        token = client.cookies['csrftoken'].value
+        response = client.post(reverse('core:home'), {
+            'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello',
+            'csrfmiddlewaretoken': token, 'form_token': re.search(r'name="form_token" value="([^"]+)"', page)[1],
+        }, follow=True)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertContains(response, 'Thank you for your message!')
+
+    def test_nav_link_depends_on_the_visitor(self):
+        self.assertContains(self.client.get(reverse('core:home')), 'Admin Login')
+        self.client.force_login(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        self.assertContains(self.client.get(reverse('core:home')), 'Dashboard')
+
+
+class StylesheetTests(TestCase):
+    def test_pages_link_the_compiled_stylesheet(self):
+        for url in (reverse('core:home'), reverse('dashboard_login')):
+            with self.subTest(url):
+                response = self.client.get(url)
+                self.assertContains(response, '/static/core/css/portfolio.css')
+                self.assertNotContains(response, 'cdn.tailwindcss.com')
+
+    def test_build_css_runs_the_tailwind_cli(self):
+        with patch('shutil.which', return_value='/usr/bin/tailwindcss'), \
+                patch('subprocess.run') as run, patch('pathlib.Path.stat') as stat:
+            run.return_value.returncode = 0
+            stat.return_value.st_size = 12345
+            call_command('build_css', stdout=io.StringIO())
+        command = run.call_args.args[0]
+        self.assertEqual(command[0], '/usr/bin/tailwindcss')
+        self.assertIn('--minify', command)
+        self.assertTrue(command[command.index('--config') + 1].endswith('tailwind.config.js'))
+        self.assertTrue(command[command.index('--output') + 1].endswith('core/static/core/css/portfolio.css'))
+
+    def test_build_css_without_the_cli(self):
+        with patch('shutil.which', return_value=None), self.assertRaisesMessage(CommandError, 'pytailwindcss'):
+            call_command('build_css')
+
+    def test_missing_stylesheet_warns_in_debug(self):
+        with patch('pathlib.Path.exists', return_value=False):
+            with override_settings(DEBUG=True):
+                self.assertEqual([warning.id for warning in check_stylesheet(None)], ['core.W001'])
+            self.assertEqual(check_stylesheet(None), [])
+        with patch('pathlib.Path.exists', return_value=True), override_settings(DEBUG=True):
+            self.assertEqual(check_stylesheet(None), [])
+
+
+class StaticSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttle_cache.clear()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.enterContext(override_settings(PORTFOLIO_SNAPSHOT=True, PORTFOLIO_SNAPSHOT_ROOT=root))
+        # bulk_create skips post_save, so no rebuild stays queued in the test
+        # transaction and swallows the one the test captures.
+        PersonalInfo.objects.bulk_create([PersonalInfo(name='Imad', title='Developer')])
+
+    def read_snapshot(self):
+        with open(snapshot_path(), encoding='utf-8') as f:
+            return f.read()
+
+    def test_snapshot_is_only_rebuilt_after_a_change(self):
+        self.assertTrue(build_snapshot())
+        content = self.read_snapshot()
+        self.assertIn('Imad', content)
+        self.assertIn('Admin Login', content)
+        self.assertNotIn('__portfolio_csrf_token__', content)
+        self.assertNotIn('portfolio-hole', content)
+        self.assertFalse(build_snapshot())
+
+        with patch('core.snapshot._executor.submit', side_effect=lambda fn: fn()):
+            with self.captureOnCommitCallbacks(execute=True):
+                Skill.objects.create(name='Django')
+        self.assertIn('Django', self.read_snapshot())
+
+    @override_settings(CONTACT_FORM_MIN_SECONDS=0)
+    def test_contact_form_state_for_the_snapshot(self):
+        client = Client(enforce_csrf_checks=True)
+        state = client.get(reverse('core:contact-state')).json()
+        self.assertEqual(state['messages'], '')
+        response = client.post(reverse('core:home'), {
+            'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello', 'csrfmiddlewaretoken': state['csrf_token'],
+            'form_token': state['form_token'],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('Thank you for your message!', client.get(reverse('core:contact-state')).json()['messages'])
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every list endpoint must render with a fixed number of queries no matter
+    how many rows exist, so an N+1 regression fails here and not in production.
+    """
+    SCALE = 300
+
+    @classmethod
+    def setUpTestData(cls):
+        PersonalInfo.objects.create(name='Imad', title='Developer')
+        skills = Skill.objects.bulk_create(Skill(name=f'Skill {i}') for i in range(cls.SCALE))
+        projects = Project.objects.bulk_create(
+            Project(title=f'Project {i}', description='...', image=f'project_images/{i}.png', display_order=i)
+            for i in range(cls.SCALE)
+        )
+        Project.technologies.through.objects.bulk_create(
+            Project.technologies.through(project_id=project.pk, skill_id=skill.pk)
+            for project in projects for skill in skills[:3]
+        )
+        Experience.objects.bulk_create(
+            Experience(category=('work', 'education')[i % 2], title=f'Role {i}', company='Company',
+                       start_date=date(2000, 1, 1) + timedelta(days=i), description='...')
+            for i in range(cls.SCALE)
+        )
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name=f'Sender {i}', email=f'sender{i}@example.com', message='Hi')
+            for i in range(cls.SCALE)
+        )
+        User.objects.bulk_create(User(username=f'staff{i}', is_staff=True) for i in range(cls.SCALE))
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        # bulk_create skips the signals that keep the homepage payload current.
+        rebuild_payload()
+
+    def setUp(self):
+        cache.clear()
+        self.enterContext(without_derivative_builds())
+
+    def assertQueryBudget(self, url_name, budget):
+        with self.assertNumQueries(budget):
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+
+    def test_home_cold_cache(self):
+        # The portfolio payload, by primary key.
+        self.assertQueryBudget('core:home', 1)
+
+    def test_dashboard_partials(self):
+        self.client.force_login(self.admin)
+        # Every partial also loads the user; the session lives in the cache.
+        # Conditional partials count each listed model once on a cold cache,
+        # then read the portfolio payload.
+        budgets = {
+            'dashboard': 3,
+            'load-personal-info': 3,
+            'load-skills': 3,
+            'load-experiences': 3,
+            'load-projects': 4,
+            'load-messages': 2,
+            'load-admins': 3,
+        }
+        for url_name, budget in budgets.items():
+            with self.subTest(url_name):
+                cache.clear()
+                self.assertQueryBudget(url_name, budget)
+
+
+@skipUnless(connection.vendor == 'sqlite', "Reads SQLite's EXPLAIN QUERY PLAN output.")
+class QueryPlanTests(TestCase):
+    """
+    The queries behind the list endpoints must walk an index, never scan or
+    sort the whole table, so they stay fast as the tables grow.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_dataset(projects=300, skills=300, experiences=300, messages=3000, staff=30)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def assertUsesIndex(self, run, table_sql, index):
+        """Every query matching `table_sql` (a regex) made by `run()` is planned on `index`."""
+        with CaptureQueriesContext(connection) as captured:
+            run()
+        queries = [q['sql'] for q in captured if re.search(table_sql, q['sql'])]
+        self.assertTrue(queries, f"No query matched {table_sql!r}.")
+        for sql in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+            with self.subTest(sql=sql):
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def get(self, url_name, *args, **params):
+        response = self.client.get(reverse(url_name, args=args), params)
+        self.assertIn(response.status_code, (200, 204))
+        return b''.join(response) if response.streaming else response.content
+
+    def test_payload_rebuild(self):
+        self.assertUsesIndex(rebuild_payload, r'FROM "core_project"\s', 'project_display_order_idx')
+        self.assertUsesIndex(rebuild_payload, r'FROM "core_experience"', 'experience_start_date_idx')
+
+    def test_message_inbox(self):
+        inbox = r'FROM "core_contactmessage"'
+        self.assertUsesIndex(lambda: self.get('load-messages'), inbox, 'contactmessage_inbox_idx')
+        cursor = make_message_cursor(ContactMessage.objects.all()[100])
+        self.assertUsesIndex(lambda: self.get('load-messages', cursor=cursor), inbox, 'contactmessage_inbox_idx')
+        self.assertUsesIndex(lambda: self.get('check-new-messages'), inbox, 'contactmessage_inbox_idx')
+        self.assertUsesIndex(lambda: self.get('export', 'messages', start='2020-01-01', end='2020-12-31'),
+                             inbox, 'contactmessage_inbox_idx')
+
+    def test_admin_list(self):
+        self.assertUsesIndex(lambda: self.get('load-admins'), r'WHERE "auth_user"."is_staff"', 'user_staff_idx')
+
+
+class PortfolioPayloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(without_derivative_builds())
+
+    def test_hydrated_payload_matches_the_models(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            django = Skill.objects.create(name='Django')
+            Skill.objects.create(name='HTMX')
+            project = Project.objects.create(title='Portfolio', description='...', image='project_images/p.png')
+            project.technologies.add(django)
+            Experience.objects.create(category='education', title='B.S.', company='Uni',
+                                      start_date=date(2018, 9, 1), end_date=date(2022, 6, 1), description='...')
+        with self.assertNumQueries(1):
+            portfolio = get_portfolio()
+        self.assertIsNone(portfolio['info'])
+        self.assertEqual([s.name for s in portfolio['skills']], ['Django', 'HTMX'])
+        [hydrated] = portfolio['projects']
+        self.assertEqual(hydrated.pk, project.pk)
+        self.assertEqual(hydrated.image.name, 'project_images/p.png')
+        self.assertEqual([s.name for s in hydrated.technology_list], ['Django'])
+        self.assertEqual(portfolio['work_experiences'], [])
+        self.assertEqual(portfolio['education_experiences'][0].end_date, date(2022, 6, 1))
+
+    def test_saving_a_project_with_technologies_rebuilds_once(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        skills = Skill.objects.bulk_create([Skill(name='Django'), Skill(name='HTMX')])
+        form = ProjectForm({'title': 'Portfolio', 'description': '...', 'display_order': 0,
+                            'technologies': [skill.pk for skill in skills]},
+                           {'image': SimpleUploadedFile('p.png', png_bytes())})
+        self.assertTrue(form.is_valid(), form.errors)
+        with patch('core.signals.rebuild_payload') as rebuild, patch('core.signals.bump_portfolio_version') as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    project = form.save()  # post_save, then m2m_changed for the technologies.
+            with self.captureOnCommitCallbacks(execute=True):
+                project.technologies.clear()
+        self.assertEqual((rebuild.call_count, bump.call_count), (2, 2))
+
+    def test_rolled_back_change_does_not_swallow_the_next(self):
+        with patch('core.signals.rebuild_payload') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        Skill.objects.create(name='Django')
+                        raise ValueError
+                except ValueError:
+                    pass
+                Skill.objects.create(name='HTMX')
+        rebuild.assert_called_once_with()
+
+    def test_committed_changes_rebuild_the_payload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(name='Django')
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.name = 'Django 5'
+            skill.save()
+        self.assertEqual([s.name for s in get_portfolio()['skills']], ['Django 5'])
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        self.assertEqual(get_portfolio()['skills'], [])
+
+    def test_missing_payload_is_rebuilt_on_read(self):
+        Skill.objects.create(name='Django')  # on_commit never runs in a TestCase.
+        self.assertContains(self.client.get(reverse('core:home')), 'Django')
+        with self.assertNumQueries(1):
+            self.assertEqual([s.name for s in get_portfolio()['skills']], ['Django'])
+
+    def test_bulk_delete_rebuilds_the_payload(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        skills = Skill.objects.bulk_create(Skill(name=f'Skill {i}') for i in range(3))
+        rebuild_payload()
+        self.client.post(reverse('bulk-delete-skills'), {'ids': [s.pk for s in skills[:2]]})
+        self.assertEqual([s.name for s in get_portfolio()['skills']], ['Skill 2'])
+
+
+class ConditionalPartialTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        Skill.objects.create(name='Django')
+
+    def test_unchanged_partial_is_not_modified(self):
+        first = self.client.get(reverse('load-skills'))
+        self.assertIn('no-cache', first['Cache-Control'])
+        # Only the user is loaded.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('load-skills'), headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(reverse('load-skills'), headers={'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_saving_a_row_changes_the_etag(self):
+        first = self.client.get(reverse('load-projects'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.filter(name='Django').get().save()
+        response = self.client.get(reverse('load-projects'), headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+class AsyncViewTests(TestCase):
+    """The read paths under ASGI, where any sync query would raise SynchronousOnlyOperation."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        PersonalInfo.objects.create(name='Ada', title='Developer')
+        project = Project.objects.create(title='Demo', description='...', image='project_images/demo.png')
+        project.technologies.add(Skill.objects.create(name='Django'))
+        Experience.objects.create(title='Engineer', company='ACME', start_date=date(2020, 1, 1), description='...')
+        self.enterContext(patch('core.images._submit'))
+
+    async def test_home_and_partials_render_under_asgi(self):
+        response = await self.async_client.get(reverse('core:home'))
+        self.assertContains(response, 'Demo')
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(reverse('core:home'))
+        self.assertContains(response, 'Dashboard</a>')
+        for name in ('load-personal-info', 'load-skills', 'load-experiences', 'load-projects',
+                     'load-messages', 'load-admins'):
+            with self.subTest(name):
+                response = await self.async_client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+
+    async def test_conditional_partial_under_asgi(self):
+        await self.async_client.aforce_login(self.admin)
+        first = await self.async_client.get(reverse('load-projects'))
+        response = await self.async_client.get(reverse('load-projects'), headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_check_new_messages_under_asgi(self):
+        await self.async_client.aforce_login(self.admin)
+        await ContactMessage.objects.acreate(name='Old', email='old@example.com', message='Hi')
+        await self.async_client.get(reverse('load-messages'))
+        response = await self.async_client.get(reverse('check-new-messages'))
+        self.assertEqual(response.status_code, 204)
+        message = await ContactMessage.objects.acreate(name='New', email='new@example.com', message='Hi')
+        await ContactMessage.objects.filter(pk=message.pk).aupdate(sent_at=timezone.now() + timedelta(seconds=1))
+        response = await self.async_client.get(reverse('check-new-messages'))
+        self.assertEqual(response['HX-Trigger'], 'newMessage, messages-changed')
+
+    async def test_partials_redirect_anonymous_users(self):
+        response = await self.async_client.get(reverse('load-skills'))
+        self.assertEqual(response.status_code, 302)
+
+
+class MessageEventStreamTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def test_wsgi_request_falls_back_to_polling(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse('message-events')).status_code, 204)
+
+    def test_dashboard_keeps_polling_while_the_stream_is_open(self):
+        # Messages saved by another worker never reach this worker's hub.
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(reverse('dashboard')), 'every 30s [window.messageStreamOpen]')
+
+    async def test_new_contact_message_is_pushed(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(reverse('message-events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        await anext(stream)  # retry hint, sent once the stream has subscribed
+        message_hub.publish('newMessage', 'messages-changed')
+        self.assertEqual(await anext(stream), b'event: newMessage\ndata: newMessage\n\n')
+        self.assertEqual(await anext(stream), b'event: messages-changed\ndata: messages-changed\n\n')
+        # On disconnect the ASGI handler cancels the task reading the stream.
+        reader = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        reader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await reader
+        self.assertEqual(message_hub.subscriber_count, 0)
+
+    def test_saving_a_message_publishes(self):
+        with patch.object(message_hub, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                ContactMessage.objects.create(name='Ada', email='ada@example.com', message='Hi')
+        publish.assert_called_once_with('newMessage', 'messages-changed')
+
+
+class MessageInboxPaginationTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name=f'Sender {i}', email=f'sender{i}@example.com', message='Hi')
+            for i in range(MESSAGES_PAGE_SIZE * 2 + 5)
+        )
+        # Identical timestamps force the cursor to fall back on `id`.
+        ContactMessage.objects.update(sent_at=timezone.now())
+
+    def test_pages_cover_the_inbox_exactly_once(self):
+        response = self.client.get(reverse('load-messages'))
+        seen = [m.pk for m in response.context['messages']]
+        while cursor := response.context['next_cursor']:
+            response = self.client.get(reverse('load-messages'), {'cursor': cursor})
+            self.assertTemplateNotUsed(response, 'core/partials/messages_list.html')
+            seen += [m.pk for m in response.context['messages']]
+        expected = list(ContactMessage.objects.values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+    async def test_inbox_remembers_the_newest_message_in_a_database_session(self):
+        await self.async_client.aforce_login(await User.objects.aget(username='admin'))
+        response = await self.async_client.get(reverse('load-messages'))
+        self.assertEqual(response.status_code, 200)
+        newest = await ContactMessage.objects.order_by('-sent_at', '-id').afirst()
+        session = await self.async_client.asession()
+        self.assertEqual(await session.aget('last_message_timestamp'), newest.sent_at.isoformat())
+
+    def test_first_page_renders_load_more_sentinel(self):
+        response = self.client.get(reverse('load-messages'))
+        self.assertEqual(len(response.context['messages']), MESSAGES_PAGE_SIZE)
+        self.assertContains(response, 'hx-trigger="intersect once"')
+
+
+@override_settings(CONTACT_INGEST_ASYNC=True)
+class ContactMessageQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttle_cache.clear()
+        self.queue = ContactMessageQueue(max_size=3)
+        # Flush in the test thread instead of a writer thread.
+        patcher = patch.object(self.queue, 'start')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_message(self, i):
+        return ContactMessage(name=f'Sender {i}', email=f'sender{i}@example.com', message='Hi')
+
+    def test_flush_writes_pending_messages_in_one_batch(self):
+        for i in range(3):
+            self.assertTrue(self.queue.put(self.make_message(i)))
+        self.assertEqual(ContactMessage.objects.count(), 0)
+        with patch.object(message_hub, 'publish') as publish:
+            self.assertEqual(self.queue.flush(), 3)
+        publish.assert_called_once_with('newMessage', 'messages-changed')
+        self.assertEqual(ContactMessage.objects.count(), 3)
+
+    def test_failed_batch_is_saved_row_by_row_and_published_once(self):
+        for i in range(2):
+            self.queue.put(self.make_message(i))
+        with patch.object(ContactMessage.objects, 'bulk_create', side_effect=Exception("Deadlock")), \
+                patch.object(message_hub, 'publish') as publish, self.assertLogs('core.ingest'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.queue.flush(), 2)
+        publish.assert_called_once_with('newMessage', 'messages-changed')
+        self.assertEqual(len(search('sender')), 2)
+
+    def test_sent_at_is_when_the_message_was_queued(self):
+        queued_at = timezone.now()
+        self.queue.put(self.make_message(0))
+        with patch('django.utils.timezone.now', return_value=queued_at + timedelta(minutes=5)):
+            self.queue.flush()
+        self.assertLess(ContactMessage.objects.get().sent_at, queued_at + timedelta(seconds=1))
+
+    def test_exit_handler_is_registered_once(self):
+        writer = ContactMessageQueue(flush_interval=0.01)
+        with patch('core.ingest.atexit.register') as register:
+            for _ in range(2):
+                writer.start()
+                writer.stop()
+        register.assert_called_once_with(writer.stop)
+
+    def test_full_queue_rejects_submission(self):
+        for i in range(3):
+            self.queue.put(self.make_message(i))
+        self.assertFalse(self.queue.put(self.make_message(3)))
+
+    def test_home_reports_rejected_submission(self):
+        with patch('core.views.contact_message_queue', self.queue):
+            for i in range(3):
+                self.queue.put(self.make_message(i))
+            response = self.client.post(reverse('core:home'), {
+                'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello',
+                'form_token': make_form_token(time.time() - 60),
+            })
+        self.assertContains(response, 'Please try again in a minute.')
+
+
+class ContactSpamFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttle_cache.clear()
+
+    def post(self, age=60, headers=None, **overrides):
+        """Submits the contact form and returns the flash message it redirects with."""
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello there',
+                'form_token': make_form_token(time.time() - age), **overrides}
+        response = self.client.post(reverse('core:home'), data, headers=headers)
+        self.assertRedirects(response, '/#contact-form', fetch_redirect_response=False)
+        return [str(message) for message in get_messages(response.wsgi_request)][-1]
+
+    def counters(self):
+        return dict(get_counters())
+
+    def test_traps_reject_without_writing(self):
+        with self.assertNumQueries(0):
+            self.assertIn('Thank you', self.post(website='http://spam.example'))  # Looks accepted.
+            self.assertIn('That was quick!', self.post(age=0))
+            self.assertIn('This form has expired.', self.post(form_token='forged'))
+            self.assertIn('This form has expired.', self.post(age=2 * 24 * 60 * 60))
+        self.assertEqual(ContactMessage.objects.count(), 0)
+        counters = self.counters()
+        self.assertEqual(counters['Honeypot filled in'], 1)
+        self.assertEqual(counters['Submitted too quickly'], 1)
+        self.assertEqual(counters['Missing or expired form token'], 2)
+
+    def test_duplicate_message_is_dropped(self):
+        self.post()
+        self.assertIn('Thank you', self.post(message='  HELLO   there '))
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(self.counters()['Duplicate message'], 1)
+
+    @override_settings(CONTACT_RATE_LIMIT_IP=(2, 1), CONTACT_RATE_LIMIT_EMAIL=(10, 1))
+    def test_rate_limit_per_ip(self):
+        for i in range(2):
+            self.assertIn('Thank you', self.post(email=f'sender{i}@example.com'))
+        with self.assertNumQueries(0):
+            self.assertIn('Please try again later.', self.post(email='sender2@example.com'))
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(self.counters()['Rate limited (IP)'], 1)
+
+    @override_settings(CONTACT_RATE_LIMIT_EMAIL=(1, 1))
+    def test_rate_limit_per_email(self):
+        self.post(message='First')
+        self.assertIn('Please try again later.', self.post(message='Second', email='ADA@example.com'))
+        self.assertEqual(self.counters()['Rate limited (email)'], 1)
+
+    def test_token_bucket_refills(self):
+        key = 'contact-rate:test'
+        self.assertTrue(take_token(key, 2, 3600, now=1000))
+        self.assertTrue(take_token(key, 2, 3600, now=1000))
+        self.assertFalse(take_token(key, 2, 3600, now=1000))
+        self.assertTrue(take_token(key, 2, 3600, now=1001))
+
+    @override_settings(NUM_PROXIES=1, CONTACT_RATE_LIMIT_IP=(1, 1))
+    def test_rate_limit_uses_the_forwarded_client_address(self):
+        first = {'X-Forwarded-For': '198.51.100.7'}
+        self.assertIn('Thank you', self.post(email='a@example.com', headers=first))
+        self.assertIn('try again later', self.post(email='b@example.com', headers=first))
+        # A client prepending its own X-Forwarded-For entry is still keyed on the proxy's.
+        spoofed = {'X-Forwarded-For': '10.0.0.1, 198.51.100.7'}
+        self.assertIn('try again later', self.post(email='c@example.com', headers=spoofed))
+        self.assertIn('Thank you', self.post(email='d@example.com', headers={'X-Forwarded-For': '198.51.100.8'}))
+
+    def test_counters_on_the_metrics_page(self):
+        self.post()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.assertContains(self.client.get(reverse('load-metrics')), 'Contact Form Submissions')
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        buffer = io.BytesIO()
+        PILImage.new('RGB', (1200, 600), 'purple').save(buffer, format='PNG')
+        self.name = default_storage.save('project_images/demo.png', ContentFile(buffer.getvalue()))
+
+    def test_build_derivatives_caps_widths_at_original(self):
+        manifest = build_derivatives(self.name)
+        self.assertEqual([width for _, width in manifest['webp']], [320, 640, 1024, 1200])
+        self.assertTrue(default_storage.exists(derivative_name(self.name, 320, 'webp')))
+        self.assertEqual(get_derivatives(self.name), manifest)
+
+    def test_project_card_uses_cached_srcset(self):
+        build_derivatives(self.name)
+        project = Project.objects.create(title='Demo', description='...', image=self.name)
+        response = self.client.get(reverse('core:home'))
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, f'{derivative_name(project.image.name, 640, "webp")} 640w')
+
+    def test_missing_manifest_falls_back_to_original(self):
+        with patch('core.templatetags.portfolio_tags.schedule_derivatives') as schedule:
+            Project.objects.create(title='Demo', description='...', image=self.name)
+            response = self.client.get(reverse('core:home'))
+        schedule.assert_called_with(self.name)
+        self.assertNotContains(response, '<source')
+        self.assertContains(response, 'src="/media/project_images/demo.png"')
+
+    def test_a_queue_of_builds_bumps_the_version_once(self):
+        release = threading.Event()
+        with patch('core.images.build_derivatives', side_effect=lambda name: release.wait(5)), \
+                patch('core.images.bump_portfolio_version') as bump, patch('core.images.schedule_snapshot') as snapshot:
+            for i in range(3):
+                with self.captureOnCommitCallbacks(execute=True):
+                    schedule_derivatives(f'project_images/{i}.png')
+            release.set()
+            image_executor.submit(lambda: None).result(5)  # Wait for the queue to drain.
+        bump.assert_called_once_with()
+        snapshot.assert_called_once_with()
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.name = default_storage.save('cv/cv.pdf', ContentFile(bytes(range(256)) * 4))
+        self.url = reverse('media', args=[self.name])
+
+    def test_full_response_and_revalidation(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(256)) * 4)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get(self.url, headers={'If-Modified-Since': response['Last-Modified']}).status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+
+        response = self.client.get(self.url, headers={'Range': 'bytes=-4'})
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(252, 256)))
+        response = self.client.get(self.url, headers={'Range': 'bytes=2000-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+        # A stale If-Range gets the whole, current file.
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_content_hashed_names_are_immutable(self):
+        name = default_storage.save('project_images/demo.3f2a9c1b7e4d.png', ContentFile(b'png'))
+        response = self.client.get(reverse('media', args=[name]))
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_paths_outside_media_root_are_not_found(self):
+        self.assertEqual(self.client.get(reverse('media', args=['../manage.py'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('media', args=['cv'])).status_code, 404)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_accel_redirect_mode(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response.content, b'')
+
+
+class UploadStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.enterContext(patch('core.signals.schedule_derivatives'))
+
+    def create_project(self, content, filename='demo.png'):
+        return Project.objects.create(title='Demo', description='...',
+                                      image=SimpleUploadedFile(filename, content))
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.create_project(b'same bytes', 'one.PNG')
+        second = self.create_project(b'same bytes', 'two.png')
+        info = PersonalInfo.objects.create(title='Developer', cv=SimpleUploadedFile('cv.png', b'same bytes'))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(info.cv.name, first.image.name)
+        self.assertRegex(first.image.name, r'^blobs/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertNotEqual(self.create_project(b'other bytes').image.name, first.image.name)
+        self.assertEqual(len(default_storage.listdir(posixpath.dirname(first.image.name))[1]), 1)
+
+    def test_racing_identical_uploads_both_get_the_blob(self):
+        name = self.create_project(b'same bytes').image.name
+        # The other upload passed its exists() check before this one wrote the blob.
+        with patch.object(content_storage, 'exists', return_value=False):
+            self.assertEqual(content_storage.save('demo.png', ContentFile(b'same bytes')), name)
+        with content_storage.open(name) as blob:
+            self.assertEqual(blob.read(), b'same bytes')
+
+    def test_failed_write_leaves_no_blob(self):
+        def chunks():
+            yield b'the first half'
+            raise OSError("No space left on device")
+
+        upload = ContentFile(b'the first half and the rest')
+        with patch.object(upload, 'chunks', side_effect=[[b'the first half and the rest'], chunks()]):
+            with self.assertRaises(OSError):
+                content_storage.save('demo.png', upload)
+        directory = 'blobs/' + hashlib.sha256(b'the first half and the rest').hexdigest()[:2]
+        self.assertEqual(content_storage.listdir(directory)[1], [])
+
+    def test_blob_is_deleted_with_its_last_reference(self):
+        first = self.create_project(b'same bytes')
+        second = self.create_project(b'same bytes')
+        name = first.image.name
+        default_storage.save(derivative_name(name, 320, 'webp'), ContentFile(b'webp'))
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(default_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(default_storage.exists(derivative_name(name, 320, 'webp')))
+
+    def test_replaced_file_is_released(self):
+        info = PersonalInfo.objects.create(title='Developer', cv=SimpleUploadedFile('cv.pdf', b'old cv'))
+        old_name = info.cv.name
+        info = PersonalInfo.objects.get(pk=info.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            info.cv = SimpleUploadedFile('cv.pdf', b'new cv')
+            info.save()
+        self.assertFalse(default_storage.exists(old_name))
+        self.assertTrue(default_storage.exists(info.cv.name))
+
+    def test_gc_media_removes_only_old_orphans(self):
+        kept = self.create_project(b'kept').image.name
+        kept_derivative = default_storage.save(derivative_name(kept, 320, 'webp'), ContentFile(b'webp'))
+        orphans = [
+            default_storage.save('blobs/ab/' + 'ab' * 32 + '.png', ContentFile(b'orphan')),
+            default_storage.save('project_images/legacy.png', ContentFile(b'legacy')),
+            default_storage.save(derivative_name('project_images/gone.png', 640, 'webp'), ContentFile(b'webp')),
+        ]
+        out = io.StringIO()
+        call_command('gc_media', '--min-age=0', '--dry-run', stdout=out)
+        self.assertIn('Would delete 3 orphaned file(s).', out.getvalue())
+        self.assertTrue(all(default_storage.exists(name) for name in orphans))
+
+        call_command('gc_media', stdout=io.StringIO())
+        self.assertTrue(all(default_storage.exists(name) for name in orphans))  # Too recent.
+        call_command('gc_media', '--min-age=0', stdout=io.StringIO())
+        self.assertFalse(any(default_storage.exists(name) for name in orphans))
+        self.assertTrue(default_storage.exists(kept))
+        self.assertTrue(default_storage.exists(kept_derivative))
+
+    def test_hashed_uploads_are_served_as_immutable(self):
+        name = self.create_project(b'png').image.name
+        response = self.client.get(reverse('media', args=[name]))
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertRegex(derivative_name(name, 640, 'webp'), CONTENT_HASHED_NAME)
+
+
+class PortfolioApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(without_derivative_builds())
+        with self.captureOnCommitCallbacks(execute=True):
+            django = Skill.objects.create(name='Django')
+            self.project = Project.objects.create(title='Portfolio', description='...', image='project_images/p.png')
+            self.project.technologies.add(django)
+
+    def api(self, resource, **kwargs):
+        return self.client.get(reverse('core:api', args=(resource,)), **kwargs)
+
+    def test_projects_with_technologies_and_media_urls(self):
+        response = self.api('projects')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        [project] = response.json()['data']
+        self.assertEqual(project['title'], 'Portfolio')
+        self.assertEqual(project['technologies'], ['Django'])
+        self.assertEqual(project['image'], '/media/project_images/p.png')
+        self.assertNotIn(b'", "', response.content)  # Compact separators.
+
+    def test_field_selection(self):
+        response = self.api('projects', data={'fields': 'title, id'})
+        self.assertEqual(response.json(), {'data': [{'id': self.project.pk, 'title': 'Portfolio'}]})
+        self.assertEqual(self.api('projects', data={'fields': 'title,password'}).status_code, 400)
+        self.assertEqual(self.api('users').status_code, 404)
+        self.assertEqual(self.api('personal-info').json(), {'data': None})
+
+    def test_revalidation_and_cache_headers(self):
+        response = self.api('skills')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('s-maxage=', response['Cache-Control'])
+        self.assertEqual(response['Access-Control-Allow-Origin'], '*')
+        with self.assertNumQueries(0):
+            revalidated = self.api('skills', headers={'If-None-Match': response['ETag']})
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(self.api('skills').content, response.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='HTMX')
+        changed = self.api('skills', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        self.assertEqual([s['name'] for s in changed.json()['data']], ['Django', 'HTMX'])
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_bulk_delete_messages_in_one_round_trip(self):
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name='Spam', email='spam@example.com', message='Buy now') for _ in range(200)
+        )
+        ids = list(ContactMessage.objects.values_list('pk', flat=True))
+        ids_kept, ids_deleted = ids[:1], ids[1:]
+        # Select the rows, delete their search documents, delete them in batches.
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('bulk-delete-messages'), {'ids': ids_deleted})
+        self.assertEqual(response['HX-Trigger'], 'messages-changed')
+        self.assertEqual(list(ContactMessage.objects.values_list('pk', flat=True)), ids_kept)
+
+    def test_bulk_delete_skills_invalidates_once(self):
+        skills = Skill.objects.bulk_create(Skill(name=f'Skill {i}') for i in range(5))
+        with patch('core.bulk.bump_portfolio_version') as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('bulk-delete-skills'), {'ids': [s.pk for s in skills[:3]]})
+        bump.assert_called_once_with()
+        self.assertEqual(response['HX-Trigger'], 'skills-changed')
+        self.assertEqual(Skill.objects.count(), 2)
+
+    def test_reorder_projects(self):
+        projects = Project.objects.bulk_create(
+            Project(title=f'Project {i}', description='...', image='x.png', display_order=i) for i in range(3)
+        )
+        order = [projects[2].pk, projects[0].pk, projects[1].pk]
+        response = self.client.post(reverse('reorder-projects'), {'order': order})
+        self.assertEqual(response['HX-Trigger'], 'projects-changed')
+        self.assertEqual(list(Project.objects.values_list('pk', flat=True)), order)
+
+    def test_bulk_forms_post_the_csrf_token_from_the_dashboard_shell(self):
+        # The lists can be answered with a 304, so a token rendered into them
+        # would go stale after logging in again; the shell sends it instead.
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.get(username='admin'))
+        skills = client.get(reverse('load-skills'))
+        self.assertNotContains(skills, 'csrfmiddlewaretoken')
+        token = re.search(r'"X-CSRFToken": "([^"]+)"', client.get(reverse('dashboard')).content.decode())[1]
+        skill = Skill.objects.create(name='Django')
+        response = client.post(reverse('bulk-delete-skills'), {'ids': [skill.pk]}, headers={'X-CSRFToken': token})
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Skill.objects.exists())
+
+    def test_import_skills_from_csv_skips_existing_names(self):
+        Skill.objects.create(name='Django')
+        upload = SimpleUploadedFile('skills.csv', b'name\nDjango\nHTMX\nPostgreSQL\nHTMX\n')
+        response = self.client.post(reverse('import-skills'), {'file': upload})
+        self.assertEqual(response['HX-Trigger'], 'skills-changed')
+        self.assertEqual(sorted(Skill.objects.values_list('name', flat=True)), ['Django', 'HTMX', 'PostgreSQL'])
+
+    def test_import_experiences_from_json_is_all_or_nothing(self):
+        rows = [
+            {'category': 'work', 'title': 'Engineer', 'company': 'Acme', 'start_date': '2020-01-01', 'description': '...'},
+            {'category': 'work', 'title': 'Engineer', 'company': 'Acme', 'start_date': 'not a date', 'description': '...'},
+        ]
+        upload = SimpleUploadedFile('experiences.json', json.dumps(rows).encode())
+        response = self.client.post(reverse('import-experiences'), {'file': upload})
+        self.assertContains(response, 'Row 2: start_date')
+        self.assertFalse(Experience.objects.exists())
+
+        upload = SimpleUploadedFile('experiences.json', json.dumps(rows[:1]).encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('import-experiences'), {'file': upload})
+        self.assertEqual(Experience.objects.count(), 1)
+        self.assertEqual(search('engineer')[0]['object'].company, 'Acme')
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_messages_csv_is_filtered_by_date(self):
+        old = ContactMessage.objects.create(name='Old', email='old@example.com', message='Hi')
+        ContactMessage.objects.filter(pk=old.pk).update(sent_at=timezone.now() - timedelta(days=30))
+        ContactMessage.objects.create(name='New', email='new@example.com', message='=HYPERLINK("evil")')
+        response = self.client.get(reverse('export', args=['messages']),
+                                   {'format': 'csv', 'start': (timezone.localdate() - timedelta(days=1)).isoformat()})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,name,email,message,sent_at')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('new@example.com,"\'=HYPERLINK(""evil"")"', lines[1])
+
+    def test_portfolio_jsonl_covers_every_content_type(self):
+        project = Project.objects.create(title='Portfolio', description='...', image='x.png')
+        project.technologies.add(Skill.objects.create(name='Django'))
+        response = self.client.get(reverse('export', args=['portfolio']), {'format': 'jsonl'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['type'] for row in rows], ['skills', 'projects'])
+        self.assertEqual(rows[1]['technologies'], ['Django'])
+
+    def test_bad_requests_and_non_staff(self):
+        self.assertEqual(self.client.get(reverse('export', args=['portfolio']), {'format': 'csv'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export', args=['messages']), {'start': 'yesterday'}).status_code, 400)
+        self.client.force_login(User.objects.create_user('visitor', password='pw'))
+        self.assertEqual(self.client.get(reverse('export', args=['messages'])).status_code, 302)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        await ContactMessage.objects.acreate(name='Ada', email='ada@example.com', message='Hi')
+        admin = await User.objects.aget(username='admin')
+        await self.async_client.aforce_login(admin)
+        response = await self.async_client.get(reverse('export', args=['messages']), {'format': 'jsonl'})
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(content)['email'], 'ada@example.com')
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.project = Project.objects.create(title='Realtime dashboard', description='Built with HTMX and Django.')
+        Experience.objects.create(title='Backend Engineer', company='Acme', start_date=date(2020, 1, 1),
+                                  description='Scaled Postgres.')
+        self.message = ContactMessage.objects.create(name='Grace', email='grace@example.com', message='Loved the dashboard!')
+
+    def test_search_matches_titles_bodies_and_prefixes(self):
+        self.assertEqual({r['kind'] for r in search('dashboard')}, {'project', 'message'})
+        self.assertEqual([r['object'].company for r in search('acm')], ['Acme'])
+        # The project matches on its title, so it ranks above the message body.
+        self.assertEqual(search('dashboard')[0]['object'], self.project)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.project.title = 'Portfolio site'
+        self.project.save()
+        self.assertEqual([r['kind'] for r in search('dashboard')], ['message'])
+        self.message.delete()
+        self.assertEqual(search('dashboard'), [])
+
+    def test_queued_messages_are_indexed(self):
+        queue = ContactMessageQueue()
+        with override_settings(CONTACT_INGEST_ASYNC=True), patch.object(queue, 'start'):
+            queue.put(ContactMessage(name='Linus', email='linus@example.com', message='Kernel question'))
+            queue.flush()
+        self.assertEqual([r['object'].name for r in search('kernel')], ['Linus'])
+
+    def test_user_input_cannot_break_the_query(self):
+        self.assertEqual(search('"dash* OR) NEAR('), [])
+
+    def test_search_partial(self):
+        response = self.client.get(reverse('search'), {'q': 'grace'})
+        self.assertContains(response, 'Loved the dashboard!')
+
+
+class FileCacheCounterTests(TestCase):
+    """The production cache without REDIS_URL, whose incr() drops the timeout."""
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.enterContext(override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+            'throttle': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                         'LOCATION': os.path.join(location, 'throttle')},
+        }))
+
+    def later(self, seconds):
+        return patch('time.time', return_value=time.time() + seconds)
+
+    def test_counter_keeps_its_timeout(self):
+        self.assertEqual([incr_counter('test-counter', 3600) for _ in range(3)], [1, 2, 3])
+        with self.later(600):  # Past the backend's default 300s timeout.
+            self.assertEqual(get_counter('test-counter'), 3)
+            self.assertEqual(incr_counter('test-counter', 3600), 4)
+        with self.later(3601):
+            self.assertEqual(get_counter('test-counter'), 0)
+            self.assertEqual(incr_counter('test-counter', 3600), 1)
+
+    def test_counters_without_a_timeout_never_expire(self):
+        incr_counter('test-counter')
+        with self.later(7 * 24 * 60 * 60):
+            self.assertEqual(get_counter('test-counter'), 1)
+
+    def test_portfolio_version_outlives_the_default_timeout(self):
+        bump_portfolio_version()
+        version = get_portfolio_version()
+        with self.later(7 * 24 * 60 * 60):
+            self.assertEqual(get_portfolio_version(), version)
+        bump_portfolio_version()
+        self.assertNotEqual(get_portfolio_version(), version)
+
+    def test_contact_outcome_counters_outlive_the_default_timeout(self):
+        record('accepted')
+        record('accepted')
+        with self.later(24 * 60 * 60):
+            self.assertEqual(dict(get_counters())['Accepted'], 2)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+                   LOGIN_FREE_ATTEMPTS_IP=4, LOGIN_FREE_ATTEMPTS_USERNAME=2)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttle_cache.clear()
+        User.objects.create_user('staff', 'staff@example.com', 'right-password', is_staff=True)
+        self.hashed = []
+        user_login_failed.connect(self.on_login_failed)
+        self.addCleanup(user_login_failed.disconnect, self.on_login_failed)
+
+    def on_login_failed(self, **kwargs):
+        self.hashed.append(kwargs['credentials']['username'])
+
+    def login(self, username='staff', password='wrong-password', ip='198.51.100.1'):
+        return self.client.post(reverse('dashboard_login'), {'username': username, 'password': password},
+                                REMOTE_ADDR=ip)
+
+    def test_each_attempt_hashes_the_password_once(self):
+        with patch('django.contrib.auth.hashers.MD5PasswordHasher.verify', autospec=True,
+                   side_effect=lambda *args: False) as verify:
+            self.login()
+        self.assertEqual(verify.call_count, 1)
+        self.assertEqual(self.hashed, ['staff'])
+
+    def test_username_is_locked_out_after_its_free_attempts(self):
+        for i in range(2):
+            self.assertEqual(self.login(ip=f'198.51.100.{i}').status_code, 200)
+        response = self.login(ip='198.51.100.9')  # The first attempt past the free ones is let through...
+        self.assertEqual(response.status_code, 200)
+        response = self.login(password='right-password', ip='198.51.100.10')  # ...and then the username waits.
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertContains(response, 'Too many failed attempts.', status_code=429)
+        self.assertEqual(len(self.hashed), 3)
+
+    def test_ip_is_locked_out_across_usernames(self):
+        for i in range(5):
+            self.login(username=f'guess{i}')
+        self.assertEqual(self.login(username='another').status_code, 429)
+        self.assertEqual(len(self.hashed), 5)
+
+    def test_clearing_the_page_cache_keeps_the_lockout(self):
+        for _ in range(3):
+            self.login()
+        cache.clear()
+        self.assertEqual(self.login().status_code, 429)
+
+    @override_settings(LOGIN_FAILURE_WINDOW=3600)
+    def test_failures_are_remembered_for_the_window(self):
+        for _ in range(3):
+            self.login()
+        with patch('time.time', return_value=time.time() + 600):
+            self.assertEqual(self.login().status_code, 200)  # The lock has expired, the failures haven't...
+            self.assertEqual(self.login().status_code, 429)  # ...so the next lock is twice as long.
+
+    @override_settings(LOGIN_LOCKOUT_BASE=2, LOGIN_LOCKOUT_MAX=30)
+    def test_lockout_doubles_up_to_the_maximum(self):
+        self.assertEqual([lockout_seconds(failures, 2) for failures in range(8)], [0, 0, 2, 4, 8, 16, 30, 30])
+
+    def test_successful_login_clears_the_failures(self):
+        self.login()
+        response = self.login(password='right-password')
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.client.logout()
+        for _ in range(2):
+            self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(len(self.hashed), 3)
+
+    def test_lockout_expires(self):
+        for _ in range(3):
+            self.login()
+        self.assertEqual(self.login().status_code, 429)
+        with patch('time.time', return_value=time.time() + 2):  # The cache expires the lock, too.
+            self.assertEqual(self.login().status_code, 200)
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_every_named_route_is_benchmarked(self):
+        self.assertEqual(uncovered_url_names(), [])
+
+    def test_percentile_is_nearest_rank(self):
+        self.assertEqual(percentile([5, 1, 4, 2, 3], 50), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile(list(range(1, 21)), 95), 19)
+        self.assertEqual(percentile(list(range(1, 21)), 100), 20)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_compare_flags_query_and_latency_regressions(self):
+        baseline = {'routes': {'home': {'p95_ms': 10.0, 'queries': 0, 'bytes': 1000}}}
+        results = {'routes': {'home': {'p95_ms': 20.0, 'queries': 6, 'bytes': 1000}}}
+        self.assertEqual(compare_results(results, baseline), [
+            'home: queries 0 -> 6',
+            'home: p95 10.0ms -> 20.0ms',
+        ])
+        self.assertEqual(compare_results(baseline, baseline), [])
+
+    def test_run_route_reports_queries_and_size(self):
+        user = seed_dataset(projects=5, skills=5, experiences=5, messages=5, staff=1)
+        summary = run_route(Route('load-projects', 'load-projects'), user, iterations=3, warmup=0)
+        self.assertEqual(summary['status'], [200])
+        # User, payload + the first request's Project and Skill versions.
+        self.assertEqual(summary['queries'], 4)
+        self.assertGreater(summary['bytes'], 0)
+
+    def test_session_store_comparison(self):
+        user = seed_dataset(projects=1, skills=1, experiences=1, messages=5, staff=1)
+        report = measure_session_queries(user, polls=4)
+        # One SELECT per request, plus a single write: the timestamp is stored
+        # by the dashboard and left alone by the inbox since it didn't change.
+        self.assertEqual(report['db']['session_queries'], 6 + 1)
+        self.assertEqual(report['cache']['session_queries'], 0)
+        self.assertEqual(report['signed_cookies']['session_queries'], 0)
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_login_attack_hashes_are_bounded_per_ip_and_username(self):
+        cache.clear()
+        throttle_cache.clear()
+        report = measure_login_attack(attempts=30)
+        self.assertEqual(report['one IP, many usernames']['hashed'], 21)
+        self.assertEqual(report['one username, many IPs']['hashed'], 6)
+        self.assertEqual(report['many IPs and usernames']['hashed'], 30)
+        self.assertEqual(report['one IP, many usernames']['rejected'], 9)
+
+    def test_connection_overhead_reports_the_configured_mode(self):
+        report = measure_connection_overhead(iterations=3)
+        self.assertEqual((report['mode'], report['vendor']), ('persistent', 'sqlite'))
+        self.assertGreater(report['new_connection_p50_ms'], 0)
+        self.assertGreater(report['per_request_p95_ms'], 0)
+
+    def test_measure_startup_in_a_fresh_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # An unknown API resource is answered without touching the database.
+            summary = measure_startup('/api/v1/missing/', runs=1,
+                                      env={'DATABASE_URL': f'sqlite:///{directory}/startup.sqlite3'})
+        self.assertEqual(summary['status'], [404])
+        self.assertGreater(summary['import_ms'], 0)
+        self.assertGreater(summary['warmup_ms'], 0)
+        self.assertGreaterEqual(summary['time_to_first_byte_ms'],
+                                summary['import_ms'] + summary['warmup_ms'] + summary['first_request_ms'])
+
+    def test_measure_throughput_against_a_local_server(self):
+        async def handle(reader, writer):
+            try:
+                await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                return writer.close()  # A slow client gave up.
+            writer.write(b'HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            writer.close()
+
+        async def run():
+            async with await asyncio.start_server(handle, '127.0.0.1', 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                return await measure_throughput(port, ['/'], requests=20, concurrency=4, slow_clients=1, timeout=2)
+
+        summary = asyncio.run(run())
+        self.assertEqual(summary['status'], {'204': 20})
+        self.assertGreater(summary['requests_per_second'], 0)
+
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0)
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        profile_store.clear()
+        self.enterContext(self.modify_settings(MIDDLEWARE={'prepend': 'core.middleware.RequestProfilingMiddleware'}))
+
+    def test_profiled_view_sends_server_timing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Django')
+        response = self.client.get(reverse('core:home'))
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries", tpl;dur=[\d.]+$')
+        stats = dict(profile_store.summaries())['core:home']
+        self.assertEqual(stats['count'], 1)
+        # Just the portfolio payload.
+        self.assertEqual(stats['avg_queries'], 1)
+        self.assertGreater(stats['avg_template_ms'], 0)
+        self.assertEqual(stats['avg_bytes'], len(response.content))
+
+    async def test_async_view_is_profiled_without_a_thread_hop(self):
+        await sync_to_async(Skill.objects.create)(name='Django')
+        await sync_to_async(rebuild_payload)()
+        response = await self.async_client.get(reverse('core:home'))
+        # The payload query runs in a sync_to_async thread, on that thread's connection.
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+        async def get_response(request):
+            return HttpResponse()
+        self.assertTrue(iscoroutinefunction(RequestProfilingMiddleware(get_response)))
+
+    def test_metrics_partial_is_staff_only(self):
+        self.client.force_login(User.objects.create_user('visitor', password='pw'))
+        self.assertEqual(self.client.get(reverse('load-metrics')).status_code, 302)
+        self.client.force_login(User.objects.create_user('staff', password='pw', is_staff=True))
+        self.client.get(reverse('load-skills'))
+        self.assertContains(self.client.get(reverse('load-metrics')), 'load-skills')
+
+
+class WarmUpTests(TestCase):
+    def test_templates_are_compiled_before_the_first_request(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        timings = warm_up()
+        self.assertEqual(set(timings), {'urls_ms', 'templates_ms', 'database_ms'})
+        self.assertIn('core/index.html', loader.get_template_cache)
+        self.assertIn('base.html', loader.get_template_cache)
+        self.assertNotIn('registration/password_reset_subject.txt', loader.get_template_cache)
+
+    def test_no_connection_is_left_open_for_forked_workers(self):
+        with patch('core.warmup.connections.close_all') as close_all:
+            warm_up()
+        close_all.assert_called_once_with()
+
+
+class EndpointStatsTests(TestCase):
+    def test_windows_roll_off(self):
+        stats = EndpointStats(window_seconds=60, windows=2)
+        stats.add(3, 1, 2, 1, 100, now=0)
+        stats.add(30, 10, 4, 5, 300, now=61)
+        summary = stats.summary(now=61)
+        self.assertEqual((summary['count'], summary['p50_ms'], summary['p99_ms']), (2, 5, 50))
+        self.assertEqual(summary['avg_queries'], 3)
+        self.assertEqual(stats.summary(now=125)['count'], 1)
+        self.assertIsNone(stats.summary(now=500))
@@ -0,0 +1,68 @@
+# imad/core/throttle.py
+
+import hashlib
+import time
+
+from django.conf import settings
+
+from .cache import get_counter, incr_counter, throttle_cache
+from .spam import client_ip
+
+
+# ==============================================================================
+#  DASHBOARD LOGIN THROTTLING
+# ==============================================================================
+
+# Every login attempt costs a full password hash, so failures are counted per
+# client IP and per username. Past the free attempts, each scope allows one
+# attempt per lockout window, which doubles with every further failure
+# (LOGIN_LOCKOUT_BASE, 2x, 4x, ... up to LOGIN_LOCKOUT_MAX). A rejected attempt
+# never reaches the hasher, so an attacker gets a bounded number of hashes
+# per IP and per username however fast they send requests.
+FAILURES_KEY = 'login-failures:{}:{}'
+LOCK_KEY = 'login-lock:{}:{}'
+
+
+def _scopes(request, username):
+    """(scope, digest of identifier, free attempts) for each throttled scope."""
+    return [
+        ('ip', hashlib.sha256(client_ip(request).encode()).hexdigest(), settings.LOGIN_FREE_ATTEMPTS_IP),
+        ('username', hashlib.sha256(username.strip().lower().encode()).hexdigest(),
+         settings.LOGIN_FREE_ATTEMPTS_USERNAME),
+    ]
+
+
+def lockout_seconds(failures, free):
+    """How long the attempt after `failures` failures locks its scope for."""
+    if failures < free:
+        return 0
+    return min(settings.LOGIN_LOCKOUT_MAX, settings.LOGIN_LOCKOUT_BASE * 2 ** (failures - free))
+
+
+def claim_login_attempt(request, username):
+    """
+    Returns 0 if this request may check a password for `username`, or the
+    seconds until it may try again. Past the free attempts the claim is a
+    cache `add`, so of many concurrent requests only one gets through (across
+    workers only with Redis; see CACHES in settings.py).
+    """
+    now = time.time()
+    for scope, identifier, free in _scopes(request, username):
+        duration = lockout_seconds(get_counter(FAILURES_KEY.format(scope, identifier)), free)
+        if duration and not throttle_cache.add(LOCK_KEY.format(scope, identifier), now + duration, duration):
+            locked_until = throttle_cache.get(LOCK_KEY.format(scope, identifier), now + 1)
+            return max(1, round(locked_until - now))
+    return 0
+
+
+def record_login_failure(request, username):
+    for scope, identifier, _ in _scopes(request, username):
+        incr_counter(FAILURES_KEY.format(scope, identifier), settings.LOGIN_FAILURE_WINDOW)
+
+
+def clear_login_failures(request, username):
+    """Forgets the failures of both scopes after a successful login."""
+    keys = []
+    for scope, identifier, _ in _scopes(request, username):
+        keys += [FAILURES_KEY.format(scope, identifier), LOCK_KEY.format(scope, identifier)]
+    throttle_cache.delete_many(keys)
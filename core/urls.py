@@ -10,4 +10,8 @@ urlpatterns = [
     # This file should ONLY contain the URL for your public homepage.
     # The empty path '' matches the root URL (e.g., http://127.0.0.1:8000/).
     path('', views.home, name='home'),
+    # Lets the static snapshot of the homepage (core/snapshot.py) submit the contact form.
+    path('contact/state/', views.contact_form_state, name='contact-state'),
+    # Read-only JSON API over the portfolio content (core/api.py).
+    path('api/v1/<slug:resource>/', views.api_resource, name='api'),
 ]
\ No newline at end of file
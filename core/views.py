@@ -1,20 +1,50 @@
 # imad/core/views.py
 
 # --- Django and Python Imports ---
+# Kept at module level on purpose: core.signals already imports the forms and
+# django.contrib.auth.forms from CoreConfig.ready(), so deferring them here
+# saves nothing, and the rest of this module imports in about 13ms of a ~340ms
+# cold start (`manage.py benchmark_startup`, `python -X importtime`).
+import asyncio
+import os
+from datetime import date, datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth import login, logout
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import HttpResponse
-
-# --- Local Imports: Models and Forms ---
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.dateparse import parse_date
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import condition, require_POST, require_safe
+
+# --- Local Imports: Models, Forms and Caching ---
 from .models import PersonalInfo, Skill, Project, Experience, ContactMessage
 from .forms import (
     ContactForm, ProjectForm, SkillForm, PersonalInfoForm, ExperienceForm,
-    AdminCreationForm, AdminChangeForm
+    AdminCreationForm, AdminChangeForm, BulkImportForm
 )
+from . import api, bulk, media, spam, throttle
+from .cache import aget_model_version, aget_portfolio_version, arender_cached_page
+from .events import message_hub
+from .export import EXPORT_FORMATS, astream_export, export_querysets, stream_export
+from .ingest import contact_message_queue
+from .payload import aget_portfolio, get_portfolio
+from .search import search
+from .profiling import profile_store
 
 
 # ==============================================================================
@@ -28,33 +58,211 @@ def create_htmx_trigger_response(trigger_name):
     return response
 
 
+# Like login_required, but also turns away logged-in users who aren't staff.
+staff_required = user_passes_test(lambda user: user.is_staff, login_url='/dashboard/login/')
+
+
+def async_login_required(view):
+    """
+    login_required for async views. The user is loaded with `auser()` and
+    stored on `request.user`, so decorators and templates can read it without
+    a synchronous database query (which would fail in the event loop).
+    """
+    view = login_required(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        request.user = await request.auser()
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def conditional_partial(*models):
+    """
+    Lets the browser revalidate an async partial that lists `models`: the ETag
+    and Last-Modified come from the cached per-model versions (core/cache.py),
+    so an unchanged partial is answered with a 304 before any query runs.
+    """
+    def etag(request, *args, **kwargs):
+        # Flash messages are rendered into the partial, so never 304 over them.
+        if len(messages.get_messages(request)):
+            return None
+        tokens = '-'.join(version['token'] for version in request.model_versions)
+        return f'{request.user.pk}-{tokens}'
+
+    def last_modified(request, *args, **kwargs):
+        dates = [version['last_modified'] for version in request.model_versions]
+        return max(filter(None, dates), default=None)
+
+    def decorator(view):
+        # `no-cache` still stores the response but revalidates it on every use.
+        conditional_view = cache_control(private=True, no_cache=True)(
+            condition(etag_func=etag, last_modified_func=last_modified)(view)
+        )
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            # `condition` calls etag/last_modified synchronously, so look the versions up first.
+            request.model_versions = [await aget_model_version(model) for model in models]
+            return await conditional_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==============================================================================
+#  HELPER FUNCTIONS FOR THE MESSAGES INBOX
+# ==============================================================================
+
+MESSAGES_PAGE_SIZE = 25
+
+def get_latest_message_timestamp():
+    """Returns the newest message's `sent_at` with a single indexed lookup."""
+    latest = ContactMessage.objects.order_by('-sent_at').values_list('sent_at', flat=True)[:1]
+    return latest[0] if latest else None
+
+def remember_latest_message(request, sent_at):
+    """
+    Stores the newest message the admin has seen. The session is only marked
+    modified (and so only written back) when the timestamp actually changes.
+    """
+    timestamp = sent_at.isoformat()
+    if request.session.get('last_message_timestamp') != timestamp:
+        request.session['last_message_timestamp'] = timestamp
+
+async def aremember_latest_message(request, sent_at):
+    """remember_latest_message() for async views, whatever the SESSION_ENGINE."""
+    timestamp = sent_at.isoformat()
+    if await request.session.aget('last_message_timestamp') != timestamp:
+        await request.session.aset('last_message_timestamp', timestamp)
+
+def make_message_cursor(message):
+    """Encodes the position just after `message` in the (-sent_at, -id) ordering."""
+    return f'{message.sent_at.isoformat()}~{message.pk}'
+
+def parse_message_cursor(value):
+    """Decodes a cursor from `make_message_cursor`, or returns None if invalid."""
+    try:
+        sent_at, pk = value.rsplit('~', 1)
+        return datetime.fromisoformat(sent_at), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+async def aget_message_page(cursor=None):
+    """
+    Returns up to MESSAGES_PAGE_SIZE + 1 messages after `cursor` (keyset
+    pagination); the extra row only tells the caller whether there is more.
+    """
+    messages_qs = ContactMessage.objects.order_by('-sent_at', '-id')
+    if cursor:
+        sent_at, pk = cursor
+        messages_qs = messages_qs.filter(Q(sent_at__lt=sent_at) | Q(sent_at=sent_at, pk__lt=pk))
+    return [message async for message in messages_qs[:MESSAGES_PAGE_SIZE + 1]]
+
+
 # ==============================================================================
 #  PUBLIC-FACING VIEW
 # ==============================================================================
 
-def home(request):
+def get_home_context(form=None):
+    """Builds the context for the public homepage from the portfolio payload (core/payload.py)."""
+    return {**get_portfolio(), 'form': form or ContactForm()}
+
+async def aget_home_context():
+    """get_home_context() for async views."""
+    return {**await aget_portfolio(), 'form': ContactForm()}
+
+async def home(request):
     """
     Handles the public homepage and the contact form submission.
+    GET requests are served from the versioned page cache (see core/cache.py).
     """
     if request.method == 'POST':
-        form = ContactForm(request.POST)
-        if form.is_valid():
-            form.save()
-            # On successful form submission, we can add a success message if needed
+        return await sync_to_async(submit_contact_form)(request)
+    # The nav hole reads request.user; load it without a sync query.
+    request.user = await request.auser()
+    return await arender_cached_page(request, 'home', 'core/index.html', aget_home_context)
+
+CONTACT_REJECTION_MESSAGES = {
+    'bad_token': "This form has expired. Please send your message again.",
+    'too_fast': "That was quick! Please send your message again.",
+    'ip_rate_limited': "You've sent several messages already. Please try again later.",
+    'email_rate_limited': "You've sent several messages already. Please try again later.",
+}
+
+def submit_contact_form(request):
+    # Stays sync: the message may be written inline (CONTACT_INGEST_ASYNC=False).
+    form = ContactForm(request.POST)
+    if form.is_valid():
+        # Spam and floods are turned away before anything is written (see core/spam.py).
+        outcome = spam.screen_submission(request, form.cleaned_data)
+        if outcome is None:
+            # The message is written in the background (see core/ingest.py)
+            outcome = 'accepted' if contact_message_queue.put(form.save(commit=False)) else 'queue_full'
+        spam.record(outcome)
+
+        if outcome == 'accepted' or outcome in spam.SILENT_REJECTIONS:
+            if outcome == 'accepted':
+                spam.remember_submission(form.cleaned_data)
             messages.success(request, "Thank you for your message! I'll get back to you soon.")
             return redirect('/#contact-form')
-    else:
-        form = ContactForm()
+        if outcome in CONTACT_REJECTION_MESSAGES:
+            # Back to the cached page, so shedding a submission doesn't query either.
+            messages.error(request, CONTACT_REJECTION_MESSAGES[outcome])
+            return redirect('/#contact-form')
+        messages.error(request, "Too many messages are arriving right now. Please try again in a minute.")
 
-    context = {
-        'info': PersonalInfo.objects.first(),
-        'skills': Skill.objects.all(),
-        'work_experiences': Experience.objects.filter(category='work'),
-        'education_experiences': Experience.objects.filter(category='education'),
-        'projects': Project.objects.all(),
-        'form': form,
-    }
-    return render(request, 'core/index.html', context)
+    # Rejected submissions are rendered from scratch so the form keeps its errors.
+    return render(request, 'core/index.html', get_home_context(form))
+
+
+@never_cache
+def contact_form_state(request):
+    """
+    The CSRF token and flash messages for the contact form, which the static
+    snapshot of the homepage (core/snapshot.py) is rendered without.
+    """
+    return JsonResponse({
+        'csrf_token': get_token(request),
+        'form_token': spam.make_form_token(),
+        'messages': render_to_string('core/partials/flash_messages.html', request=request),
+    })
+
+
+@require_safe
+def serve_media(request, path):
+    """Uploaded files (CV, images); see core/media.py."""
+    return media.serve(request, path)
+
+
+# ==============================================================================
+#  READ-ONLY JSON API (core/api.py)
+# ==============================================================================
+
+@require_safe
+async def api_resource(request, resource):
+    """
+    Serves a portfolio resource as JSON, trimmed to `?fields=a,b` if given.
+    The ETag is the portfolio version, so revalidating costs a cache lookup
+    and no query; Cache-Control lets a CDN share the response.
+    """
+    if resource not in api.RESOURCES:
+        return JsonResponse({'error': f"Unknown resource '{resource}'."}, status=404)
+    try:
+        fields = api.parse_fields(resource, request.GET.get('fields'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    version = await aget_portfolio_version()
+    etag = quote_etag(f'{api.API_VERSION}-{version}')
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(await api.aget_resource(resource, fields, version), content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=api.API_MAX_AGE, s_maxage=api.API_SHARED_MAX_AGE,
+                        stale_while_revalidate=api.API_STALE_WHILE_REVALIDATE)
+    # Public, read-only and cookie-free, so any frontend may fetch it.
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
 
 
 # ==============================================================================
@@ -64,18 +272,27 @@ def home(request):
 def custom_login_view(request):
     """
     A custom, secure login view that only allows staff members to log in.
+    Attempts are throttled per client IP and per username (core/throttle.py)
+    before the password is hashed, and the form's own authenticate() is the
+    only hash per attempt.
     """
     if request.user.is_authenticated:
         return redirect('dashboard')
     if request.method == 'POST':
+        username = request.POST.get('username', '')
+        if retry_after := throttle.claim_login_attempt(request, username):
+            messages.error(request, f"Too many failed attempts. Try again in {retry_after} seconds.")
+            response = render(request, 'core/login.html', {'form': AuthenticationForm()}, status=429)
+            response['Retry-After'] = retry_after
+            return response
         form = AuthenticationForm(request, data=request.POST)
+        if form.is_valid() and form.get_user().is_staff:
+            throttle.clear_login_failures(request, username)
+            login(request, form.get_user())
+            return redirect('dashboard')
+        throttle.record_login_failure(request, username)
         if form.is_valid():
-            user = authenticate(username=form.cleaned_data.get('username'), password=form.cleaned_data.get('password'))
-            if user is not None and user.is_staff:
-                login(request, user)
-                return redirect('dashboard')
-            else:
-                messages.error(request, "Invalid credentials or not an admin user.")
+            messages.error(request, "Invalid credentials or not an admin user.")
         else:
             messages.error(request, "Invalid username or password.")
     return render(request, 'core/login.html', {'form': AuthenticationForm()})
@@ -87,8 +304,8 @@ def dashboard_view(request):
     """
     info = PersonalInfo.objects.first()
     # Set the timestamp for real-time message notifications
-    if messages_qs := ContactMessage.objects.all():
-        request.session['last_message_timestamp'] = messages_qs.first().sent_at.isoformat()
+    if latest_sent_at := get_latest_message_timestamp():
+        remember_latest_message(request, latest_sent_at)
     return render(request, 'core/dashboard.html', {'info': info})
 
 def custom_logout_view(request):
@@ -103,46 +320,94 @@ def custom_logout_view(request):
 #  HTMX PARTIAL VIEWS (FOR LOADING CONTENT INTO THE DASHBOARD)
 # ==============================================================================
 
-@login_required
-def load_personal_info(request):
-    return render(request, 'core/partials/personal_info_card.html', {'info': PersonalInfo.objects.first()})
-
-@login_required
-def load_skills(request):
-    return render(request, 'core/partials/skills_list.html', {'skills': Skill.objects.all()})
-
-@login_required
-def load_experiences(request):
+# The read-only partials are async: under ASGI they query with the async ORM
+# and never pin a worker thread. Querysets are fetched before rendering,
+# since templates can't query from the event loop. Portfolio content comes
+# from the payload (core/payload.py), one primary-key lookup.
+
+@async_login_required
+@conditional_partial(PersonalInfo)
+async def load_personal_info(request):
+    portfolio = await aget_portfolio()
+    return render(request, 'core/partials/personal_info_card.html', {'info': portfolio['info']})
+
+@async_login_required
+@conditional_partial(Skill)
+async def load_skills(request):
+    portfolio = await aget_portfolio()
+    return render(request, 'core/partials/skills_list.html', {'skills': portfolio['skills']})
+
+@async_login_required
+@conditional_partial(Experience)
+async def load_experiences(request):
+    portfolio = await aget_portfolio()
     context = {
-        'work_experiences': Experience.objects.filter(category='work'),
-        'education_experiences': Experience.objects.filter(category='education')
+        'work_experiences': portfolio['work_experiences'],
+        'education_experiences': portfolio['education_experiences'],
     }
     return render(request, 'core/partials/experiences_list.html', context)
 
-@login_required
-def load_projects(request):
-    return render(request, 'core/partials/projects_table.html', {'projects': Project.objects.all()})
+@async_login_required
+@conditional_partial(Project, Skill)
+async def load_projects(request):
+    portfolio = await aget_portfolio()
+    return render(request, 'core/partials/projects_table.html', {'projects': portfolio['projects']})
 
-@login_required
-def load_messages(request):
-    messages_qs = ContactMessage.objects.all()
-    if messages_qs:
-        request.session['last_message_timestamp'] = messages_qs.first().sent_at.isoformat()
-    return render(request, 'core/partials/messages_list.html', {'messages': messages_qs})
+@async_login_required
+async def load_messages(request):
+    """
+    Renders the inbox one page at a time. Later pages are fetched by the
+    "load more" sentinel in messages_page.html with a `cursor` parameter.
+    """
+    cursor = parse_message_cursor(request.GET.get('cursor'))
+    page = await aget_message_page(cursor)
+    has_more = len(page) > MESSAGES_PAGE_SIZE
+    page = page[:MESSAGES_PAGE_SIZE]
+    context = {
+        'messages': page,
+        'next_cursor': make_message_cursor(page[-1]) if has_more else None,
+    }
 
-@login_required
-def load_admins(request):
+    if cursor:
+        return render(request, 'core/partials/messages_page.html', context)
+    if page:
+        await aremember_latest_message(request, page[0].sent_at)
+    return render(request, 'core/partials/messages_list.html', context)
+
+@async_login_required
+@conditional_partial(User)
+async def load_admins(request):
     # Exclude the current user from the deletable list for safety, can be handled in template
-    admins = User.objects.filter(is_staff=True)
+    admins = [admin async for admin in User.objects.filter(is_staff=True)]
     return render(request, 'core/partials/admins_list.html', {'admins': admins})
 
-def check_new_messages(request):
-    """HTMX polling view to check for new messages and send a real-time notification."""
-    last_seen_timestamp = request.session.get('last_message_timestamp')
+@login_required
+def search_portfolio(request):
+    """Live search over projects, experiences and messages (see core/search.py)."""
+    query = request.GET.get('q', '').strip()
+    return render(request, 'core/partials/search_results.html', {'query': query, 'results': search(query)})
+
+@staff_required
+def load_metrics(request):
+    """Rolling per-endpoint timings from RequestProfilingMiddleware (this process only)."""
+    context = {
+        'endpoints': profile_store.summaries(),
+        'sample_rate': settings.REQUEST_PROFILING_SAMPLE_RATE,
+        'pid': os.getpid(),
+        'contact_counters': spam.get_counters(),
+    }
+    return render(request, 'core/partials/metrics.html', context)
+
+async def check_new_messages(request):
+    """
+    HTMX polling view to check for new messages and send a real-time notification.
+    Fallback for dashboards that can't hold a `message_events` stream open.
+    """
+    last_seen_timestamp = await request.session.aget('last_message_timestamp')
     if not last_seen_timestamp: return HttpResponse(status=204) # No content, do nothing
     
     # Check if a newer message exists
-    if ContactMessage.objects.filter(sent_at__gt=last_seen_timestamp).exists():
+    if await ContactMessage.objects.filter(sent_at__gt=last_seen_timestamp).aexists():
         response = HttpResponse(status=200) # OK
         # Trigger both a general new message alert and the specific messages list reload
         response['HX-Trigger'] = 'newMessage, messages-changed'
@@ -150,6 +415,65 @@ def check_new_messages(request):
     
     return HttpResponse(status=204) # No content, do nothing
 
+MESSAGE_STREAM_KEEPALIVE = 25 # seconds; keeps proxies from closing an idle stream
+
+@login_required
+async def message_events(request):
+    """
+    Server-Sent Events stream of dashboard notifications (see core/events.py).
+    Only served under ASGI; under WSGI a 204 tells the browser's EventSource
+    not to reconnect, and the dashboard keeps polling `check_new_messages`.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    async def event_stream():
+        queue = message_hub.subscribe()
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), MESSAGE_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                else:
+                    yield f'event: {event}\ndata: {event}\n\n'
+        finally:
+            message_hub.unsubscribe(queue)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # Don't let a front proxy buffer the stream
+    return response
+
+
+def parse_export_date(value):
+    if not value:
+        return None
+    if parsed := parse_date(value):
+        return parsed
+    raise ValueError(f"'{value}' is not a YYYY-MM-DD date.")
+
+@staff_required
+def export_data(request, dataset):
+    """
+    Streams a dataset (see core/export.py) as `?format=csv` or `jsonl`.
+    Messages can be limited with `?start=` and `?end=` dates (YYYY-MM-DD).
+    """
+    fmt = request.GET.get('format', 'csv')
+    try:
+        start, end = (parse_export_date(request.GET.get(name)) for name in ('start', 'end'))
+        querysets = export_querysets(dataset, fmt, start, end)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    # Under ASGI the rows are fetched asynchronously, so a long export doesn't tie up a thread.
+    stream = astream_export if isinstance(request, ASGIRequest) else stream_export
+    response = StreamingHttpResponse(stream(querysets, fmt), content_type=EXPORT_FORMATS[fmt])
+    filename = f'portfolio-{dataset}-{date.today().isoformat()}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 
 # ==============================================================================
 #  CRUD (CREATE, UPDATE, DELETE) VIEWS
@@ -316,4 +640,56 @@ def delete_message(request, pk):
     if request.method == 'POST':
         message.delete()
         return create_htmx_trigger_response('messages-changed')
-    return render(request, 'core/partials/message_delete_confirm.html', {'message': message})
\ No newline at end of file
+    return render(request, 'core/partials/message_delete_confirm.html', {'message': message})
+
+
+# ==============================================================================
+#  BULK ACTIONS (see core/bulk.py). Each answers with a single refresh trigger.
+# ==============================================================================
+
+def get_selected_ids(request, name='ids'):
+    """The primary keys posted as `name`, ignoring anything that isn't a number."""
+    return [int(pk) for pk in request.POST.getlist(name) if pk.isdigit()]
+
+@login_required
+@require_POST
+def bulk_delete_messages(request):
+    bulk.delete_rows(ContactMessage, get_selected_ids(request))
+    return create_htmx_trigger_response('messages-changed')
+
+@login_required
+@require_POST
+def bulk_delete_skills(request):
+    bulk.delete_rows(Skill, get_selected_ids(request))
+    return create_htmx_trigger_response('skills-changed')
+
+@login_required
+@require_POST
+def reorder_projects(request):
+    """Saves the order the projects were dragged into on the projects table."""
+    bulk.reorder_projects(get_selected_ids(request, 'order'))
+    return create_htmx_trigger_response('projects-changed')
+
+def bulk_import(request, import_rows, trigger_name, title, columns):
+    """Shared GET/POST handling for the CSV/JSON import modals."""
+    if request.method == 'POST':
+        form = BulkImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                import_rows(form.cleaned_data['file'])
+            except ValidationError as e:
+                form.add_error('file', e)
+            else:
+                return create_htmx_trigger_response(trigger_name)
+    else:
+        form = BulkImportForm()
+    return render(request, 'core/partials/bulk_import_form.html', {'form': form, 'title': title, 'columns': columns})
+
+@login_required
+def import_skills(request):
+    return bulk_import(request, bulk.import_skills, 'skills-changed', "Import Skills", ['name'])
+
+@login_required
+def import_experiences(request):
+    columns = ['category', 'title', 'company', 'start_date', 'end_date', 'description']
+    return bulk_import(request, bulk.import_experiences, 'experiences-changed', "Import Experiences", columns)
@@ -0,0 +1,75 @@
+# imad/core/warmup.py
+
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+#  WORKER WARM-UP (see WARM_UP_ON_START in settings.py)
+# ==============================================================================
+
+# portfolio_project/wsgi.py and asgi.py call warm_up() once the application is
+# loaded, before the server hands the worker any traffic, so instances that
+# scale from zero don't make their first visitor wait for it.
+
+
+def project_template_names():
+    """The names of every template under BASE_DIR, e.g. 'core/index.html'."""
+    engine = engines['django'].engine
+    directories = [*engine.dirs, *get_app_template_dirs('templates')]
+    for directory in map(str, directories):
+        if not directory.startswith(str(settings.BASE_DIR)):
+            continue  # Third-party templates are compiled if they're ever used.
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt')):
+                    yield os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+
+
+def warm_up():
+    """
+    Populates the URL resolvers, compiles the project's templates into the
+    cached loader and checks that the database is reachable. Returns how
+    long each step took, in milliseconds.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    # Reading `reverse_dict` populates a resolver (and imports its views).
+    root = get_resolver()
+    for resolver in [root, *(included for _, included in root.namespace_dict.values())]:
+        resolver.reverse_dict
+    timings['urls_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    engine = engines['django']
+    for name in sorted(set(project_template_names())):
+        engine.get_template(name)
+    timings['templates_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    try:
+        connection.ensure_connection()
+    except DatabaseError:
+        logger.warning("Could not connect to the database during warm-up.", exc_info=True)
+    finally:
+        # Under `gunicorn --preload` this runs in the master, and every worker
+        # forked from it would share an open connection's socket. Close them
+        # (and any pool) so each worker opens its own on its first query.
+        connections.close_all()
+        if getattr(connection, 'pool', None):
+            connection.close_pool()
+    timings['database_ms'] = (time.perf_counter() - start) * 1000
+
+    logger.info("Warmed up in %.1fms (%s).", sum(timings.values()),
+                ', '.join(f'{step} {ms:.1f}' for step, ms in timings.items()))
+    return timings
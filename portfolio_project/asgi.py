@@ -3,6 +3,12 @@ ASGI config for portfolio_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving the project through this module (e.g. ``uvicorn portfolio_project.asgi:application``)
+enables the dashboard's Server-Sent Events stream (``core.views.message_events``);
+under WSGI the dashboard falls back to polling ``check_new_messages``. The read
+paths (homepage, dashboard partials, polling) are async views, so slow clients
+don't each hold a thread; ``manage.py benchmark_servers`` compares both servers.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +20,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
 
 application = get_asgi_application()
+
+# Compile templates and check the database before taking traffic (core/warmup.py).
+from django.conf import settings
+
+if settings.WARM_UP_ON_START:
+    from core.warmup import warm_up
+    warm_up()
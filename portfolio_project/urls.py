@@ -2,7 +2,6 @@
 
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from core import views as core_views
 
 urlpatterns = [
@@ -18,7 +17,10 @@ urlpatterns = [
     path('htmx/load-projects/', core_views.load_projects, name='load-projects'),
     path('htmx/load-messages/', core_views.load_messages, name='load-messages'),
     path('htmx/load-admins/', core_views.load_admins, name='load-admins'),
+    path('htmx/search/', core_views.search_portfolio, name='search'),
+    path('htmx/load-metrics/', core_views.load_metrics, name='load-metrics'),
     path('htmx/check-new-messages/', core_views.check_new_messages, name='check-new-messages'),
+    path('htmx/message-events/', core_views.message_events, name='message-events'),
 
     # --- CRUD ACTIONS ---
     path('personal-info/<int:pk>/update/', core_views.update_personal_info, name='update-personal-info'),
@@ -36,9 +38,19 @@ urlpatterns = [
     path('admins/<int:pk>/update/', core_views.update_admin, name='update-admin'),
     path('admins/<int:pk>/delete/', core_views.delete_admin, name='delete-admin'),
 
+    # --- BULK ACTIONS ---
+    path('messages/bulk-delete/', core_views.bulk_delete_messages, name='bulk-delete-messages'),
+    path('skills/bulk-delete/', core_views.bulk_delete_skills, name='bulk-delete-skills'),
+    path('skills/import/', core_views.import_skills, name='import-skills'),
+    path('experiences/import/', core_views.import_experiences, name='import-experiences'),
+    path('projects/reorder/', core_views.reorder_projects, name='reorder-projects'),
+
+    # --- EXPORTS ---
+    path('export/<slug:dataset>/', core_views.export_data, name='export'),
+
+    # --- MEDIA (CV, project and profile images), in development and production ---
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", core_views.serve_media, name='media'),
+
     # --- PUBLIC HOMEPAGE ---
     path('', include('core.urls')),
-]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file
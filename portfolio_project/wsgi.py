@@ -17,3 +17,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
 
 application = get_wsgi_application()
+
+# Compile templates and check the database before taking traffic (core/warmup.py).
+from django.conf import settings
+
+if settings.WARM_UP_ON_START:
+    from core.warmup import warm_up
+    warm_up()